@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from .api import ElogClient
+from typing import TYPE_CHECKING
+
 from .config import Config
 from .exceptions import (
     APIError,
@@ -11,7 +12,10 @@ from .exceptions import (
     FetchElogError,
     LockError,
 )
-from .storage import Database
+
+if TYPE_CHECKING:
+    from .api import ElogClient
+    from .storage import Database
 
 __version__ = "0.1.0"
 
@@ -25,3 +29,17 @@ __all__ = [
     "FetchElogError",
     "LockError",
 ]
+
+
+def __getattr__(name: str):
+    # Load the HTTP client and storage layers on first use so importing
+    # elogfetch (e.g. for the CLI entry point) stays cheap
+    if name == "ElogClient":
+        from .api import ElogClient
+
+        return ElogClient
+    if name == "Database":
+        from .storage import Database
+
+        return Database
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from .client import ElogClient
+from .experiment_data import fetch_experiment_data
 from .experiments import fetch_updated_experiments
 from .file_manager import fetch_file_manager
 from .info import fetch_experiment_info
-from .logbook import fetch_logbook
+from .logbook import fetch_logbook, fetch_logbooks
 from .runtable import fetch_runtable
 from .questionnaire import fetch_questionnaire
 from .workflow import fetch_workflow
@@ -14,9 +15,11 @@ from .workflow import fetch_workflow
 __all__ = [
     "ElogClient",
     "fetch_updated_experiments",
+    "fetch_experiment_data",
     "fetch_experiment_info",
     "fetch_file_manager",
     "fetch_logbook",
+    "fetch_logbooks",
     "fetch_runtable",
     "fetch_questionnaire",
     "fetch_workflow",
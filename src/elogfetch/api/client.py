@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import os
+import socket
 import subprocess
+import threading
 import time
 from typing import Any
 
 import requests
 from krtc import KerberosTicket
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 
 from ..exceptions import APIError, AuthenticationError, TransientError
 from ..utils import get_logger
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON decoding for large payloads
+    orjson = None
+
 logger = get_logger()
 
 # Default values (can be overridden via Config)
@@ -24,6 +35,39 @@ RETRY_BASE_DELAY = 2.0
 REQUEST_TIMEOUT = 30
 TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
 
+# Connection pool size; should be at least the number of concurrent workers
+DEFAULT_POOL_SIZE = 16
+# Quick transport-level retries for failed connects (nothing sent yet);
+# status-code retries stay in ElogClient.get so TransientError is preserved
+CONNECT_RETRIES = 2
+CONNECT_BACKOFF = 0.3
+
+# urllib3 already disables Nagle (TCP_NODELAY); add keepalive probes so dead
+# pooled connections are detected instead of failing the next request
+KEEPALIVE_IDLE_SECS = 60
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    SOCKET_OPTIONS.append(
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE_SECS)
+    )
+
+# Kerberos auth headers are shared by all clients in the process, keyed by
+# principal, and refreshed after AUTH_CACHE_TTL seconds (well below the TGT
+# lifetime) or when the server answers 401
+AUTH_CACHE_TTL = 300
+_AUTH_CACHE: dict[str, tuple[dict[str, str], float]] = {}
+_AUTH_LOCK = threading.Lock()
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use SOCKET_OPTIONS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
 
 class ElogClient:
     """HTTP client for SLAC elog API with Kerberos authentication."""
@@ -32,20 +76,42 @@ class ElogClient:
         self,
         base_url: str | None = None,
         kerberos_principal: str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
     ):
         """Initialize the client.
 
         Args:
             base_url: Base URL for the elog API (default: SLAC pswww)
             kerberos_principal: Kerberos principal for authentication
+            pool_size: Maximum number of pooled connections per host
         """
         self.base_url = base_url or DEFAULT_BASE_URL
         self.kerberos_principal = kerberos_principal or DEFAULT_KERBEROS_PRINCIPAL
-        self._auth_headers: dict[str, str] | None = None
         self._session = requests.Session()
 
+        # Size the pool so concurrent fetches don't discard connections
+        adapter = _KeepAliveAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=CONNECT_RETRIES,
+                connect=CONNECT_RETRIES,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=CONNECT_BACKOFF,
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
     def _check_kerberos_auth(self) -> bool:
         """Check if Kerberos authentication is valid."""
+        probe = _probe_credentials_cache()
+        if probe is not None:
+            return probe
+
         try:
             result = subprocess.run(
                 ["klist", "-s"],
@@ -56,6 +122,17 @@ class ElogClient:
         except (subprocess.CalledProcessError, FileNotFoundError):
             return False
 
+    def authenticate(self) -> None:
+        """Obtain Kerberos auth headers up front.
+
+        Call before fanning out to worker threads so a missing or expired
+        ticket fails once, clearly, instead of in every worker.
+
+        Raises:
+            AuthenticationError: If Kerberos ticket is not available
+        """
+        self._get_auth_headers()
+
     def _get_auth_headers(self) -> dict[str, str]:
         """Get Kerberos authentication headers.
 
@@ -65,20 +142,29 @@ class ElogClient:
         Raises:
             AuthenticationError: If Kerberos ticket is not available
         """
-        if self._auth_headers is not None:
-            return self._auth_headers
+        with _AUTH_LOCK:
+            cached = _AUTH_CACHE.get(self.kerberos_principal)
+            if cached is not None and time.monotonic() - cached[1] < AUTH_CACHE_TTL:
+                return cached[0]
+
+            if not self._check_kerberos_auth():
+                raise AuthenticationError(
+                    "Kerberos authentication not found or expired. "
+                    "Please run 'kinit' to authenticate."
+                )
 
-        if not self._check_kerberos_auth():
-            raise AuthenticationError(
-                "Kerberos authentication not found or expired. "
-                "Please run 'kinit' to authenticate."
-            )
+            try:
+                headers = KerberosTicket(self.kerberos_principal).getAuthHeaders()
+            except Exception as e:
+                raise AuthenticationError(f"Failed to get Kerberos ticket: {e}")
 
-        try:
-            self._auth_headers = KerberosTicket(self.kerberos_principal).getAuthHeaders()
-            return self._auth_headers
-        except Exception as e:
-            raise AuthenticationError(f"Failed to get Kerberos ticket: {e}")
+            _AUTH_CACHE[self.kerberos_principal] = (headers, time.monotonic())
+            return headers
+
+    def _invalidate_auth_headers(self) -> None:
+        """Drop cached auth headers for this client's principal."""
+        with _AUTH_LOCK:
+            _AUTH_CACHE.pop(self.kerberos_principal, None)
 
     def get(
         self,
@@ -104,7 +190,6 @@ class ElogClient:
         url = f"{self.base_url}{endpoint}"
         headers = self._get_auth_headers() if require_auth else {}
 
-        last_error = None
         for attempt in range(RETRY_MAX_ATTEMPTS):
             try:
                 response = self._session.get(
@@ -113,8 +198,8 @@ class ElogClient:
 
                 # On 401, try refreshing the Kerberos ticket once
                 if response.status_code == 401 and require_auth:
-                    logger.debug(f"Got 401 for {endpoint}, refreshing auth headers")
-                    self._auth_headers = None  # Clear cached headers
+                    logger.debug("Got 401 for %s, refreshing auth headers", endpoint)
+                    self._invalidate_auth_headers()
                     headers = self._get_auth_headers()  # Get fresh headers
                     response = self._session.get(
                         url, headers=headers, params=params, timeout=REQUEST_TIMEOUT
@@ -125,6 +210,15 @@ class ElogClient:
                             f"Access denied for {endpoint}. Check if you have permission."
                         )
 
+                if response.ok:
+                    logger.debug(
+                        "Got %d bytes for %s (content-encoding: %s)",
+                        len(response.content),
+                        endpoint,
+                        response.headers.get("content-encoding", "identity"),
+                    )
+                    return _decode_json(response)
+
                 if response.status_code == 403:
                     raise AuthenticationError(
                         f"Access denied to {endpoint}. You may not have permission."
@@ -135,33 +229,40 @@ class ElogClient:
                     if attempt < RETRY_MAX_ATTEMPTS - 1:
                         delay = RETRY_BASE_DELAY * (2**attempt)
                         logger.debug(
-                            f"Got {response.status_code} for {endpoint}, "
-                            f"retrying in {delay}s (attempt {attempt + 1}/{RETRY_MAX_ATTEMPTS})"
+                            "Got %d for %s, retrying in %ss (attempt %d/%d)",
+                            response.status_code,
+                            endpoint,
+                            delay,
+                            attempt + 1,
+                            RETRY_MAX_ATTEMPTS,
                         )
                         time.sleep(delay)
                         continue
                     raise TransientError(
                         f"Server error after {RETRY_MAX_ATTEMPTS} attempts: {response.status_code}",
                         status_code=response.status_code,
-                        response=response.text[:500],
+                        response=_error_body(response),
                     )
 
-                if not response.ok:
-                    raise APIError(
-                        f"API request failed: {response.status_code}",
-                        status_code=response.status_code,
-                        response=response.text[:500],
-                    )
-
-                return response.json()
+                raise APIError(
+                    f"API request failed: {response.status_code}",
+                    status_code=response.status_code,
+                    response=_error_body(response),
+                )
 
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                last_error = e
+            except (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+            ) as e:
                 if attempt < RETRY_MAX_ATTEMPTS - 1:
                     delay = RETRY_BASE_DELAY * (2**attempt)
                     logger.debug(
-                        f"Network error for {endpoint}: {e}, "
-                        f"retrying in {delay}s (attempt {attempt + 1}/{RETRY_MAX_ATTEMPTS})"
+                        "Network error for %s: %s, retrying in %ss (attempt %d/%d)",
+                        endpoint,
+                        e,
+                        delay,
+                        attempt + 1,
+                        RETRY_MAX_ATTEMPTS,
                     )
                     time.sleep(delay)
                     continue
@@ -187,3 +288,71 @@ class ElogClient:
             JSON response from the API
         """
         return self.get(endpoint, params=params, require_auth=False)
+
+    def close(self) -> None:
+        """Close the pooled keep-alive connections."""
+        self._session.close()
+
+    def __enter__(self) -> "ElogClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _probe_credentials_cache() -> bool | None:
+    """Check for Kerberos credentials without spawning ``klist``.
+
+    Returns:
+        True/False when the credential state could be determined,
+        or None when only ``klist`` can tell
+    """
+    # Imported here so commands that never authenticate don't load it
+    try:
+        import gssapi
+    except ImportError:  # optional: lets us check credentials without klist
+        gssapi = None
+
+    if gssapi is not None:
+        try:
+            lifetime = gssapi.Credentials(usage="initiate").lifetime
+        except gssapi.exceptions.GSSError:
+            return False
+        # None means the credentials don't expire
+        return lifetime is None or lifetime > 0
+
+    # Only an explicit file-based cache can be checked directly; the
+    # default cache may be KEYRING/KCM depending on krb5.conf
+    ccname = os.environ.get("KRB5CCNAME", "")
+    if ccname.startswith("FILE:"):
+        ccname = ccname[len("FILE:") :]
+    elif not ccname.startswith("/"):
+        return None
+
+    if not os.path.exists(ccname):
+        return False
+    return None
+
+
+def _error_body(response: requests.Response) -> str:
+    """Return the start of a response body for error reporting.
+
+    Only the first 500 bytes are decoded, so a large error page is never
+    converted to str in full.
+    """
+    return response.content[:500].decode("utf-8", errors="replace")
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is None:
+        return response.json()
+
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise APIError(
+            f"Invalid JSON response: {e}",
+            status_code=response.status_code,
+            response=_error_body(response),
+        )
@@ -0,0 +1,65 @@
+"""Fetch all data types for an experiment."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Any, Callable
+
+from .client import ElogClient
+from .file_manager import fetch_file_manager
+from .info import fetch_experiment_info
+from .logbook import fetch_logbook
+from .questionnaire import fetch_questionnaire
+from .runtable import fetch_runtable
+from .workflow import fetch_workflow
+
+# Independent per-experiment fetches, keyed as expected by
+# Database.insert_experiment_batch. The questionnaire is fetched after
+# these, once "info" has supplied its proposal number.
+EXPERIMENT_FETCHERS: dict[str, Callable[[ElogClient, str], Any]] = {
+    "info": fetch_experiment_info,
+    "logbook": fetch_logbook,
+    "runtable": fetch_runtable,
+    "file_manager": fetch_file_manager,
+    "workflow": fetch_workflow,
+}
+
+
+def fetch_experiment_data(
+    client: ElogClient,
+    experiment_id: str,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    """Fetch every data type for an experiment.
+
+    Args:
+        client: ElogClient instance
+        experiment_id: The experiment ID to fetch
+        executor: Optional executor used to run the fetches concurrently;
+                  if None they run one after another
+
+    Returns:
+        Dictionary with experiment_id, one entry per EXPERIMENT_FETCHERS key
+        and the questionnaire
+    """
+    data: dict[str, Any] = {"experiment_id": experiment_id}
+
+    if executor is None:
+        for key, fetch in EXPERIMENT_FETCHERS.items():
+            data[key] = fetch(client, experiment_id)
+        data["questionnaire"] = fetch_questionnaire(
+            client, experiment_id, info=data["info"]
+        )
+        return data
+
+    futures = {
+        key: executor.submit(fetch, client, experiment_id)
+        for key, fetch in EXPERIMENT_FETCHERS.items()
+    }
+    # Start the questionnaire as soon as info is in, while the rest run
+    futures["questionnaire"] = executor.submit(
+        fetch_questionnaire, client, experiment_id, info=futures["info"].result()
+    )
+    for key, future in futures.items():
+        data[key] = future.result()
+    return data
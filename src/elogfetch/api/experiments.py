@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-import re
-from typing import Any
+from itertools import filterfalse
 
 from .client import ElogClient
-from ..utils import get_logger
+from ..utils import compile_patterns, get_logger
 
 logger = get_logger()
 
@@ -29,24 +28,21 @@ def fetch_updated_experiments(
     endpoint = "/ws/lgbk/lgbk/ws/experiment_names_updated_within"
     params = {"offset_secs": offset_secs}
 
-    logger.info(f"Fetching experiments updated in last {offset_secs} seconds...")
+    logger.info("Fetching experiments updated in last %d seconds...", offset_secs)
 
     data = client.get_public(endpoint, params=params)
 
     # Extract experiment names from the response
-    if isinstance(data, dict) and "value" in data:
-        experiments = data["value"]
-    elif isinstance(data, list):
-        experiments = data
-    else:
-        logger.error(f"Unexpected response format: {type(data)}")
+    experiments = data.get("value") if isinstance(data, dict) else data
+    if not isinstance(experiments, list):
+        logger.error("Unexpected response format: %s", type(data))
         return []
 
     if not experiments:
         logger.info("No experiments found in the specified time period.")
         return []
 
-    logger.info(f"Found {len(experiments)} experiments")
+    logger.info("Found %d experiments", len(experiments))
 
     # Apply filtering if patterns specified
     if exclude_patterns:
@@ -68,24 +64,18 @@ def _filter_experiments(
     Returns:
         Filtered list of experiment IDs
     """
-    filtered = []
-    excluded_count = 0
-
-    for exp in experiments:
-        exclude = False
-        for pattern in exclude_patterns:
-            # Convert shell-style wildcards to regex
-            regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-            if re.match(f"^{regex_pattern}$", exp, re.IGNORECASE):
-                exclude = True
-                excluded_count += 1
-                break
-
-        if not exclude:
-            filtered.append(exp)
+    if not exclude_patterns:
+        return list(experiments)
+
+    # Compiled regexes are cached by pattern list, so repeat calls are cheap
+    combined = compile_patterns(exclude_patterns)
+    filtered = list(filterfalse(combined.match, experiments))
+    excluded_count = len(experiments) - len(filtered)
 
     if excluded_count > 0:
-        logger.info(f"Excluded {excluded_count} experiments by patterns {exclude_patterns}")
+        logger.info(
+            "Excluded %d experiments by patterns %s", excluded_count, exclude_patterns
+        )
 
-    logger.info(f"Returning {len(filtered)} experiments after filtering")
+    logger.info("Returning %d experiments after filtering", len(filtered))
     return filtered
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from typing import Any
 
 from .client import ElogClient
@@ -35,11 +34,11 @@ def fetch_file_manager(
         data = client.get(endpoint)
 
         if not data.get("success"):
-            logger.error(f"API returned success=False for files of {experiment_id}")
+            logger.error("API returned success=False for files of %s", experiment_id)
             return None
 
         files = data.get("value", [])
-        logger.info(f"Fetched {len(files)} files for {experiment_id}")
+        logger.info("Fetched %d files for %s", len(files), experiment_id)
 
         # Aggregate by run number
         aggregated = _aggregate_by_run(files)
@@ -50,7 +49,7 @@ def fetch_file_manager(
         }
 
     except APIError as e:
-        logger.error(f"Failed to fetch file manager for {experiment_id}: {e}")
+        logger.error("Failed to fetch file manager for %s: %s", experiment_id, e)
         return None
 
 
@@ -63,25 +62,29 @@ def _aggregate_by_run(files: list[dict[str, Any]]) -> list[dict[str, Any]]:
     Returns:
         List of aggregated records per run
     """
-    run_data: dict[int, dict[str, Any]] = defaultdict(
-        lambda: {"number_of_files": 0, "total_size_bytes": 0}
-    )
+    # run_num -> [number_of_files, total_size_bytes]; mutating a small
+    # list in place avoids a defaultdict factory call and nested-dict
+    # string-key lookups per file
+    totals: dict[int, list[int]] = {}
+    totals_get = totals.get
 
     for file_info in files:
         run_num = file_info.get("run_num")
         if run_num is None:
             continue
 
-        size = file_info.get("size", 0) or 0
-        run_data[run_num]["number_of_files"] += 1
-        run_data[run_num]["total_size_bytes"] += size
+        acc = totals_get(run_num)
+        if acc is None:
+            acc = totals[run_num] = [0, 0]
+        acc[0] += 1
+        acc[1] += file_info.get("size") or 0
 
     # Convert to list format
     return [
         {
             "run_number": run_num,
-            "number_of_files": data["number_of_files"],
-            "total_size_bytes": data["total_size_bytes"],
+            "number_of_files": number_of_files,
+            "total_size_bytes": total_size_bytes,
         }
-        for run_num, data in sorted(run_data.items())
+        for run_num, (number_of_files, total_size_bytes) in sorted(totals.items())
     ]
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import re
 from typing import Any
 
 from .client import ElogClient
@@ -31,18 +30,18 @@ def fetch_experiment_info(
         data = client.get(endpoint)
 
         if not data.get("success"):
-            logger.error(f"API returned success=False for {experiment_id}")
+            logger.error("API returned success=False for %s", experiment_id)
             return None
 
         raw_info = data.get("value")
         if not raw_info:
-            logger.error(f"No value in response for {experiment_id}")
+            logger.error("No value in response for %s", experiment_id)
             return None
 
         return _convert_to_db_format(experiment_id, raw_info)
 
     except APIError as e:
-        logger.error(f"Failed to fetch info for {experiment_id}: {e}")
+        logger.error("Failed to fetch info for %s: %s", experiment_id, e)
         return None
 
 
@@ -58,10 +57,14 @@ def _parse_contact_info(contact_info: str | None) -> tuple[str | None, str | Non
     if not contact_info:
         return None, None
 
-    # Try to match pattern: name (email)
-    match = re.search(r"(.*?)\s*\((.*?)\)", contact_info)
-    if match:
-        return match.group(1).strip(), match.group(2).strip()
+    # Try to match pattern: name (email), using the first parenthesized part
+    open_paren = contact_info.find("(")
+    close_paren = contact_info.find(")", open_paren + 1)
+    if open_paren >= 0 and close_paren >= 0:
+        return (
+            contact_info[:open_paren].strip(),
+            contact_info[open_paren + 1:close_paren].strip(),
+        )
 
     # If no email found, return the name only
     return contact_info.strip(), None
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
 
 from .client import ElogClient
 from ..exceptions import APIError
@@ -10,6 +12,10 @@ from ..utils import get_logger
 
 logger = get_logger()
 
+# "Run number 42: running" style messages mark the start of a run
+RUN_BOUNDARY_RE = re.compile(r"run\s+number\s+(\d+)", re.IGNORECASE)
+RUNNING_RE = re.compile(r"running", re.IGNORECASE)
+
 
 def fetch_logbook(
     client: ElogClient,
@@ -30,25 +36,54 @@ def fetch_logbook(
         data = client.get(endpoint)
 
         if not data.get("success"):
-            logger.error(f"API returned success=False for logbook of {experiment_id}")
+            logger.error("API returned success=False for logbook of %s", experiment_id)
             return []
 
         raw_entries = data.get("value", [])
-        logger.info(f"Fetched {len(raw_entries)} logbook entries for {experiment_id}")
+        logger.info(
+            "Fetched %d logbook entries for %s", len(raw_entries), experiment_id
+        )
 
         return _transform_entries(experiment_id, raw_entries)
 
     except APIError as e:
-        logger.error(f"Failed to fetch logbook for {experiment_id}: {e}")
+        logger.error("Failed to fetch logbook for %s: %s", experiment_id, e)
         return []
 
 
+def fetch_logbooks(
+    client: ElogClient,
+    experiment_ids: Iterable[str],
+    max_workers: int = 16,
+) -> dict[str, list[dict[str, Any]]]:
+    """Fetch logbook entries for several experiments concurrently.
+
+    Args:
+        client: ElogClient instance (shared across worker threads)
+        experiment_ids: The experiment IDs to fetch (any iterable)
+        max_workers: Maximum number of concurrent requests
+
+    Returns:
+        Dictionary mapping experiment ID to its list of logbook entries
+    """
+    # Each result carries its own ID, so the input is only consumed once
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pairs = executor.map(
+            lambda eid: (eid, fetch_logbook(client, eid)), experiment_ids
+        )
+        return dict(pairs)
+
+
 def _transform_entries(
     experiment_id: str,
     raw_entries: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
     """Transform logbook entries to database format.
 
+    Entries are walked once in timestamp order. Entries with an explicit
+    run number (or a "run number N ... running" message) start a new run;
+    entries without one inherit the most recent run seen so far.
+
     Args:
         experiment_id: The experiment ID
         raw_entries: Raw entries from the API
@@ -56,96 +91,51 @@ def _transform_entries(
     Returns:
         List of transformed entries
     """
-    # Sort entries by timestamp
-    sorted_entries = sorted(raw_entries, key=lambda x: x.get("insert_time", ""))
-
-    # Identify run boundaries for inference
-    run_boundaries = _identify_run_boundaries(sorted_entries)
-    inferred_runs = _infer_run_numbers(sorted_entries, run_boundaries)
+    # Sort entries by timestamp (key= evaluates _sort_key once per entry)
+    sorted_entries = sorted(raw_entries, key=_sort_key)
 
     transformed = []
+    current_run = None
+
     for entry in sorted_entries:
-        entry_id = entry.get("_id")
+        run_number = entry.get("run_num")
 
-        # Use explicit run_num if available, otherwise use inferred
-        if entry.get("run_num") is not None:
-            run_number = entry["run_num"]
+        if run_number is not None:
+            current_run = run_number
         else:
-            run_number = inferred_runs.get(entry_id)
+            boundary_run = _parse_run_boundary(entry.get("content"))
+            if boundary_run is not None:
+                current_run = boundary_run
+            run_number = current_run
 
+        tags = entry.get("tags")
         transformed.append({
-            "log_id": entry_id,
+            "log_id": entry.get("_id"),
             "experiment_id": experiment_id,
             "run_number": run_number,
             "timestamp": entry.get("insert_time"),
             "content": entry.get("content"),
-            "tags": _format_tags(entry.get("tags")),
+            "tags": ",".join(tags) if tags else None,
             "author": entry.get("author"),
         })
 
     return transformed
 
 
-def _format_tags(tags: list[str] | None) -> str | None:
-    """Format tags list into a comma-separated string."""
-    if not tags:
-        return None
-    return ",".join(tags)
-
-
-def _identify_run_boundaries(
-    sorted_entries: list[dict[str, Any]],
-) -> dict[str, int]:
-    """Identify run boundaries based on explicit run numbers."""
-    run_boundaries = {}
+def _sort_key(entry: dict[str, Any]) -> str:
+    """Sort key for logbook entries; missing or null timestamps sort first."""
+    return entry.get("insert_time") or ""
 
-    for entry in sorted_entries:
-        timestamp = entry.get("insert_time")
-        run_num = entry.get("run_num")
-        content = (entry.get("content", "") or "").lower()
-
-        if run_num is not None:
-            run_boundaries[timestamp] = run_num
-        elif "run number" in content and "running" in content:
-            try:
-                parts = content.split(":")[0].split()
-                for i, part in enumerate(parts):
-                    if part.lower() == "number" and i + 1 < len(parts):
-                        run_boundaries[timestamp] = int(parts[i + 1])
-                        break
-            except (IndexError, ValueError):
-                pass
-
-    return run_boundaries
-
-
-def _infer_run_numbers(
-    sorted_entries: list[dict[str, Any]],
-    run_boundaries: dict[str, int],
-) -> dict[str, int | None]:
-    """Infer run numbers for entries without explicit run_num."""
-    boundary_times = sorted(run_boundaries.keys())
-    boundary_runs = [run_boundaries[time] for time in boundary_times]
-
-    inferred_runs = {}
-
-    for entry in sorted_entries:
-        entry_id = entry.get("_id")
-        timestamp = entry.get("insert_time")
 
-        # Skip entries with explicit run numbers
-        if entry.get("run_num") is not None:
-            continue
-
-        inferred_run = None
-        for i, boundary_time in enumerate(boundary_times):
-            if timestamp < boundary_time:
-                if i > 0:
-                    inferred_run = boundary_runs[i - 1]
-                break
-            elif i == len(boundary_times) - 1 or timestamp == boundary_time:
-                inferred_run = boundary_runs[i]
+def _parse_run_boundary(content: str | None) -> int | None:
+    """Extract the run number from a "Run number N: running" style message."""
+    if not content:
+        return None
 
-        inferred_runs[entry_id] = inferred_run
+    # Only the text before the first colon names the run; later mentions
+    # of a run number (e.g. "note: compare with run number 12") don't count
+    match = RUN_BOUNDARY_RE.search(content.partition(":")[0])
+    if match and RUNNING_RE.search(content):
+        return int(match.group(1))
 
-    return inferred_runs
+    return None
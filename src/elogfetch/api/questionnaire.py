@@ -11,41 +11,50 @@ from ..utils import get_logger
 
 logger = get_logger()
 
+# Trailing two digits of an experiment ID are the LCLS run
+LCLS_RUN_RE = re.compile(r"(\d{2})$")
+
 
 def fetch_questionnaire(
     client: ElogClient,
     experiment_id: str,
+    info: dict[str, Any] | None = None,
 ) -> dict[str, Any] | None:
     """Fetch questionnaire data for an experiment.
 
     Args:
         client: ElogClient instance
         experiment_id: The experiment ID to fetch
+        info: Experiment info from fetch_experiment_info, if already
+              fetched; its urawi_proposal saves a request to /ws/info
 
     Returns:
         Dictionary with questionnaire fields, or None on error
     """
     try:
-        # First, get experiment info to retrieve PNR
-        info_endpoint = f"/ws-kerb/lgbk/lgbk/{experiment_id}/ws/info"
-        info_data = client.get(info_endpoint)
+        if info is not None:
+            proposal_number = info.get("urawi_proposal")
+        else:
+            # Get experiment info to retrieve PNR
+            info_endpoint = f"/ws-kerb/lgbk/lgbk/{experiment_id}/ws/info"
+            info_data = client.get(info_endpoint)
 
-        if not info_data.get("success"):
-            logger.error(f"Failed to get info for {experiment_id}")
-            return None
+            if not info_data.get("success"):
+                logger.error("Failed to get info for %s", experiment_id)
+                return None
 
-        info_value = info_data.get("value", {})
-        params = info_value.get("params", {})
-        proposal_number = params.get("PNR")
+            info_value = info_data.get("value", {})
+            params = info_value.get("params", {})
+            proposal_number = params.get("PNR")
 
         if not proposal_number:
-            logger.warning(f"No proposal number (PNR) found for {experiment_id}")
+            logger.warning("No proposal number (PNR) found for %s", experiment_id)
             return None
 
         # Extract LCLS run number from experiment ID (last 2 digits)
         lcls_run = _extract_lcls_run(experiment_id)
         if not lcls_run:
-            logger.warning(f"Could not extract LCLS run from {experiment_id}")
+            logger.warning("Could not extract LCLS run from %s", experiment_id)
             return None
 
         # Fetch questionnaire
@@ -58,7 +67,9 @@ def fetch_questionnaire(
         # Parse into individual fields
         fields = _parse_questionnaire_fields(questionnaire_data)
 
-        logger.info(f"Fetched {len(fields)} questionnaire fields for {experiment_id}")
+        logger.info(
+            "Fetched %d questionnaire fields for %s", len(fields), experiment_id
+        )
 
         return {
             "experiment_id": experiment_id,
@@ -67,7 +78,7 @@ def fetch_questionnaire(
         }
 
     except APIError as e:
-        logger.error(f"Failed to fetch questionnaire for {experiment_id}: {e}")
+        logger.error("Failed to fetch questionnaire for %s: %s", experiment_id, e)
         return None
 
 
@@ -77,7 +88,7 @@ def _extract_lcls_run(experiment_id: str) -> str | None:
     The LCLS run number is the last two digits of the experiment ID.
     For example, 'tmol1039623' -> '23'
     """
-    match = re.search(r"(\d{2})$", experiment_id)
+    match = LCLS_RUN_RE.search(experiment_id)
     if match:
         return match.group(1)
     return None
@@ -99,11 +110,13 @@ def _parse_questionnaire_fields(
     if not questionnaire_data or not isinstance(questionnaire_data, dict):
         return fields
 
+    append = fields.append
     for category, category_fields in questionnaire_data.items():
         # Skip non-list entries (metadata, etc.)
         if not isinstance(category_fields, list):
             continue
 
+        prefix = f"{category}-"
         for field_data in category_fields:
             if not isinstance(field_data, dict):
                 continue
@@ -113,9 +126,9 @@ def _parse_questionnaire_fields(
                 continue
 
             # Extract field name by removing category prefix
-            field_name = field_id.replace(f"{category}-", "") if field_id else None
+            field_name = field_id.removeprefix(prefix)
 
-            fields.append({
+            append({
                 "category": category,
                 "field_id": field_id,
                 "field_name": field_name,
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
 
 from .client import ElogClient
 from ..exceptions import APIError
@@ -13,16 +14,22 @@ logger = get_logger()
 # Prefix for detector parameters in run data
 DETECTOR_PREFIX = "DAQ Detectors/"
 
+# Concurrent per-run detail requests for one experiment (there is no bulk
+# endpoint that returns run parameters for every run)
+RUN_DETAIL_WORKERS = 4
+
 
 def fetch_runtable(
     client: ElogClient,
     experiment_id: str,
+    max_workers: int = RUN_DETAIL_WORKERS,
 ) -> dict[str, Any] | None:
     """Fetch run table data for an experiment.
 
     Args:
-        client: ElogClient instance
+        client: ElogClient instance (shared across worker threads)
         experiment_id: The experiment ID to fetch
+        max_workers: Maximum number of concurrent run detail requests
 
     Returns:
         Dictionary with run data and detector info, or None on error
@@ -33,46 +40,28 @@ def fetch_runtable(
         # Fetch runs list
         runs_data = client.get(f"{base_endpoint}/runs", params={"includeParams": "false"})
         if not runs_data.get("value"):
-            logger.warning(f"No runs found for {experiment_id}")
+            logger.warning("No runs found for %s", experiment_id)
             return None
 
         runs = runs_data["value"]
-        logger.info(f"Found {len(runs)} runs for {experiment_id}")
+        logger.info("Found %d runs for %s", len(runs), experiment_id)
 
-        # Collect all detector keys first
-        all_detector_keys = set()
-        run_details = {}
-
-        for run in runs:
-            run_num = run["num"]
-            try:
-                detail = client.get(
-                    f"{base_endpoint}/runs/{run_num}",
-                    params={"includeParams": "true"},
-                )
-                run_details[run_num] = detail.get("value", {})
-                params = run_details[run_num].get("params", {})
-
-                for key in params.keys():
-                    if key.startswith(DETECTOR_PREFIX):
-                        all_detector_keys.add(key)
-
-            except APIError as e:
-                logger.warning(f"Failed to fetch run {run_num} details: {e}")
-
-        # Build result structure
         result = {
             "experiment_id": experiment_id,
             "data_production": [],
             "detectors": [],
         }
 
-        for run in runs:
-            run_num = run["num"]
-            if run_num not in run_details:
-                continue
+        # Single pass: keep the production fields and each run's detector
+        # flags, and drop the full run detail as soon as it is consumed
+        all_detector_keys = set()
+        run_detectors = []
+        run_nums = [run["num"] for run in runs]
+        details = _iter_run_details(client, base_endpoint, run_nums, max_workers)
 
-            detail = run_details[run_num]
+        for run_num, detail in zip(run_nums, details):
+            if detail is None:
+                continue
             params = detail.get("params", {})
 
             # Data production entry
@@ -87,22 +76,69 @@ def fetch_runtable(
                 "prod_end": params.get("Prod_end"),
             })
 
-            # Detector entry
+            detectors = {
+                key: value
+                for key, value in params.items()
+                if key.startswith(DETECTOR_PREFIX)
+            }
+            all_detector_keys.update(detectors)
+            run_detectors.append((run_num, detectors))
+
+        # Detector entries need every key seen across the runs
+        for run_num, detectors in run_detectors:
             detector_entry = {"run_number": run_num}
             for key in all_detector_keys:
-                detector_entry[key] = "Checked" if params.get(key) else "Unchecked"
+                detector_entry[key] = "Checked" if detectors.get(key) else "Unchecked"
             result["detectors"].append(detector_entry)
 
-        logger.info(f"Processed {len(result['data_production'])} runs for {experiment_id}")
+        logger.info(
+            "Processed %d runs for %s", len(result["data_production"]), experiment_id
+        )
         return result
 
     except APIError as e:
-        logger.error(f"Failed to fetch runtable for {experiment_id}: {e}")
+        logger.error("Failed to fetch runtable for %s: %s", experiment_id, e)
+        return None
+
+
+def _iter_run_details(
+    client: ElogClient,
+    base_endpoint: str,
+    run_nums: list[int],
+    max_workers: int,
+) -> Iterator[dict[str, Any] | None]:
+    """Yield each run's details in order, fetching up to max_workers at once."""
+    def fetch_detail(run_num):
+        return _fetch_run_detail(client, base_endpoint, run_num)
+
+    if max_workers <= 1 or len(run_nums) <= 1:
+        yield from map(fetch_detail, run_nums)
+        return
+
+    # One request per run; overlap their latency on a small pool
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(run_nums))) as executor:
+        yield from executor.map(fetch_detail, run_nums)
+
+
+def _fetch_run_detail(
+    client: ElogClient,
+    base_endpoint: str,
+    run_num: int,
+) -> dict[str, Any] | None:
+    """Fetch one run's details including parameters, or None on error."""
+    try:
+        detail = client.get(
+            f"{base_endpoint}/runs/{run_num}",
+            params={"includeParams": "true"},
+        )
+    except APIError as e:
+        logger.warning("Failed to fetch run %s details: %s", run_num, e)
         return None
+    return detail.get("value", {})
 
 
 def _format_time(time_str: str | None) -> str | None:
     """Format ISO time string for display."""
     if not time_str:
         return None
-    return time_str.replace("T", " ").split("+")[0]
+    return time_str.partition("+")[0].replace("T", " ")
@@ -30,11 +30,11 @@ def fetch_workflow(
         data = client.get(endpoint)
 
         if not data.get("success"):
-            logger.error(f"API returned success=False for workflow of {experiment_id}")
+            logger.error("API returned success=False for workflow of %s", experiment_id)
             return None
 
         workflows = data.get("value", [])
-        logger.info(f"Fetched {len(workflows)} workflows for {experiment_id}")
+        logger.info("Fetched %d workflows for %s", len(workflows), experiment_id)
 
         return {
             "experiment_id": experiment_id,
@@ -42,7 +42,7 @@ def fetch_workflow(
         }
 
     except APIError as e:
-        logger.error(f"Failed to fetch workflow for {experiment_id}: {e}")
+        logger.error("Failed to fetch workflow for %s: %s", experiment_id, e)
         return None
 
 
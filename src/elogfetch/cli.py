@@ -4,30 +4,30 @@ from __future__ import annotations
 
 import json
 import logging
-import queue
-import shutil
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+from threading import Thread
 
 import click
 
-from .api import (
-    ElogClient,
-    fetch_updated_experiments,
-    fetch_experiment_info,
-    fetch_file_manager,
-    fetch_logbook,
-    fetch_runtable,
-    fetch_questionnaire,
-    fetch_workflow,
-)
 from .config import Config
 from .exceptions import AuthenticationError, FetchElogError, LockError
-from .storage import Database, find_latest_database, generate_db_name
-from .utils import acquire_lock, get_logger, setup_logging
+from .storage import (
+    Database,
+    find_latest_database,
+    generate_db_name,
+    prepare_experiment_rows,
+)
+from .utils import ByteBoundedQueue, acquire_lock, get_logger, setup_logging
+
+# Above this many experiments, secondary indexes are dropped during the
+# update and rebuilt once at the end instead of being maintained per insert
+BULK_INDEX_THRESHOLD = 100
 
 
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
@@ -67,9 +67,15 @@ def cli(ctx, config, verbose, quiet):
               help="Update existing database incrementally. Optionally specify base database path.")
 @click.option("--queue-size", "-q", type=int, help="Queue size for streaming (default: 100)")
 @click.option("--batch-size", "-b", type=int, help="Experiments per commit batch (default: 50)")
+@click.option("--in-memory", is_flag=True,
+              help="Build the database in memory and write it to disk at the end.")
 @click.pass_context
-def update(ctx, hours, exclude, output_dir, dry_run, parallel, incremental, queue_size, batch_size):
+def update(ctx, hours, exclude, output_dir, dry_run, parallel, incremental, queue_size,
+           batch_size, in_memory):
     """Update the local database with recent experiments."""
+    # Imported per command so status and --help don't load the HTTP stack
+    from .api import ElogClient, fetch_updated_experiments
+
     logger = ctx.obj["logger"]
     config = ctx.obj["config"]
 
@@ -87,8 +93,10 @@ def update(ctx, hours, exclude, output_dir, dry_run, parallel, incremental, queu
         cli_args["queue_size"] = queue_size
     if batch_size is not None:
         cli_args["batch_commit_size"] = batch_size
+    if in_memory:
+        cli_args["in_memory"] = True
 
-    config = Config.load(cli_args=cli_args)
+    config = config.with_overrides(cli_args)
 
     # Determine output directory
     db_dir = config.database_dir or Path.cwd()
@@ -97,15 +105,18 @@ def update(ctx, hours, exclude, output_dir, dry_run, parallel, incremental, queu
     if not db_dir.exists():
         db_dir.mkdir(parents=True)
 
-    logger.info(f"Looking back {config.hours_lookback} hours")
+    logger.info("Looking back %s hours", config.hours_lookback)
     offset_secs = int(config.hours_lookback * 3600)
 
+    # One client (and connection pool) for the whole update
+    client = ElogClient(
+        base_url=config.base_url,
+        kerberos_principal=config.kerberos_principal,
+        pool_size=_pool_size(config.parallel_jobs),
+    )
+
     try:
-        # Create client and fetch experiments
-        client = ElogClient(
-            base_url=config.base_url,
-            kerberos_principal=config.kerberos_principal,
-        )
+        # Fetch experiments
         experiments = fetch_updated_experiments(
             client,
             offset_secs,
@@ -124,6 +135,9 @@ def update(ctx, hours, exclude, output_dir, dry_run, parallel, incremental, queu
                 click.echo(f"  ... and {len(experiments) - 20} more")
             return
 
+        # Fail fast on auth before starting the fetch threads
+        client.authenticate()
+
         # Acquire lock
         lock_path = db_dir / ".elogfetch.lock"
         try:
@@ -138,8 +152,68 @@ def update(ctx, hours, exclude, output_dir, dry_run, parallel, incremental, queu
         logger.error("Please run 'kinit' to authenticate.")
         sys.exit(1)
     except FetchElogError as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         sys.exit(1)
+    finally:
+        client.close()
+
+
+def _write_json(path, data):
+    """Write data as indented JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return
+
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def _pool_size(parallel_jobs):
+    """Number of pooled HTTP connections _do_update can use at once.
+
+    The shared fetch pool runs parallel_jobs requests, and each runtable
+    fetch in flight (one per concurrent experiment) adds its own run
+    detail workers.
+    """
+    from .api.runtable import RUN_DETAIL_WORKERS
+
+    return parallel_jobs + _experiment_workers(parallel_jobs) * RUN_DETAIL_WORKERS
+
+
+def _experiment_workers(parallel_jobs):
+    """Number of experiments _do_update fetches concurrently."""
+    return max(1, parallel_jobs // 2)
+
+
+def _approximate_size(rows):
+    """Estimate the in-memory size of prepared experiment rows in bytes.
+
+    Text fields dominate (logbook content in particular), so this sums
+    string lengths plus a fixed per-row overhead rather than walking every
+    object with sys.getsizeof.
+    """
+    row_overhead = 64
+    tuples = list(rows["logbook"])
+    if rows["experiment"]:
+        tuples.append(rows["experiment"])
+    for key in ("questionnaire", "workflow"):
+        if rows[key]:
+            tuples.extend(rows[key][1])
+
+    size = sum(
+        row_overhead + sum(len(v) for v in row if isinstance(v, str))
+        for row in tuples
+    )
+    for key, records in (
+        ("runtable", "data_production"),
+        ("runtable", "detectors"),
+        ("file_manager", "file_manager_records"),
+    ):
+        if rows[key]:
+            size += row_overhead * len(rows[key].get(records, []))
+    return size
 
 
 def _do_update(client, experiments, db_dir, config, logger, incremental=None):
@@ -156,6 +230,10 @@ def _do_update(client, experiments, db_dir, config, logger, incremental=None):
     Returns:
         Tuple of (success_count, failed_experiments list)
     """
+    import shutil
+
+    from .api import fetch_experiment_data
+
     db_name = generate_db_name()
     db_path = db_dir / db_name
 
@@ -169,87 +247,112 @@ def _do_update(client, experiments, db_dir, config, logger, incremental=None):
                 raise FetchElogError(f"Base database not found: {existing_db}")
 
         if existing_db:
-            logger.info(f"Incremental mode: copying {existing_db} -> {db_path}")
+            logger.info("Incremental mode: copying %s -> %s", existing_db, db_path)
             shutil.copy2(existing_db, db_path)
         else:
             logger.info("No existing database found, creating fresh database")
 
-    logger.info(f"Using database: {db_path}")
+    logger.info("Using database: %s", db_path)
 
-    # Bounded queue limits memory usage - blocks when full (backpressure)
-    data_queue = queue.Queue(maxsize=config.queue_size)
-    stop_event = Event()
+    # Bounded by item count and by approximate payload bytes, so a few huge
+    # logbooks can't pin far more memory than queue_size small ones would
+    data_queue = ByteBoundedQueue(
+        maxsize=config.queue_size,
+        max_bytes=config.queue_memory_mb * 1024 * 1024,
+    )
     error_holder = []  # To propagate writer errors
-    counter_lock = Lock()
+    # Only the writer thread mutates these; the main thread reads them
+    # after writer.join(), so no lock is needed
     success_count = 0
     failed_experiments = []
 
-    def writer_thread():
-        """Single thread that handles all database writes."""
+    def flush(db, pending):
+        """Write pending experiments in one transaction.
+
+        If the batch fails, retry experiment by experiment so one bad
+        record only fails itself.
+        """
         nonlocal success_count
-        db = Database(db_path)
-        db.enable_wal_mode()
-        batch_count = 0
+        replace = bool(incremental)
 
         try:
-            while True:
-                try:
-                    data = data_queue.get(timeout=0.5)
-                except queue.Empty:
-                    if stop_event.is_set():
-                        break
-                    continue
-
-                if data is None:  # Sentinel value signals completion
-                    break
-
-                exp_id = data["experiment_id"]
-
-                if "error" in data:
-                    with counter_lock:
-                        failed_experiments.append({
-                            "experiment_id": exp_id,
-                            "error": data["error"],
-                            "timestamp": datetime.now().isoformat(),
-                        })
-                    data_queue.task_done()
-                    continue
+            db.begin()
+            db.insert_prepared_many(pending, replace=replace)
+            db.commit()
+            success_count += len(pending)
+            return
+        except Exception as e:
+            db.rollback()
+            logger.debug("Batch write failed (%s), retrying individually", e)
 
-                try:
-                    if incremental:
-                        db.delete_experiment(exp_id)
+        for rows in pending:
+            exp_id = rows["experiment_id"]
+            try:
+                db.begin()
+                db.insert_prepared_many([rows], replace=replace)
+                db.commit()
+                success_count += 1
+            except Exception as e:
+                db.rollback()
+                logger.warning("Error writing %s: %s", exp_id, e)
+                failed_experiments.append({
+                    "experiment_id": exp_id,
+                    "error": str(e),
+                    "timestamp": time.time(),  # Formatted when written out
+                })
 
-                    db.insert_experiment_batch(data)
-                    batch_count += 1
+    def writer_thread():
+        """Single thread that handles all database writes."""
+        if config.in_memory:
+            # Staged in RAM and written to db_path by backup_to() below
+            db = Database(Path(":memory:"))
+            if db_path.exists():
+                db.load_from(db_path)
+        else:
+            db = Database(db_path)
+        db.tune_for_bulk_writes()
+        pending = []
+        bulk = (
+            db.bulk_load()
+            if len(experiments) > BULK_INDEX_THRESHOLD
+            else nullcontext()
+        )
 
-                    if batch_count >= config.batch_commit_size:
-                        db.commit()
-                        batch_count = 0
+        try:
+            with bulk:
+                while True:
+                    data = data_queue.get()
 
-                    with counter_lock:
-                        success_count += 1
+                    if data is None:  # Sentinel value signals completion
+                        break
 
-                except Exception as e:
-                    logger.warning(f"Error writing {exp_id}: {e}")
-                    with counter_lock:
+                    if "error" in data:
                         failed_experiments.append({
-                            "experiment_id": exp_id,
-                            "error": str(e),
-                            "timestamp": datetime.now().isoformat(),
+                            "experiment_id": data["experiment_id"],
+                            "error": data["error"],
+                            "timestamp": time.time(),  # Formatted when written out
                         })
+                    else:
+                        pending.append(data)
+                        if len(pending) >= config.batch_commit_size:
+                            flush(db, pending)
+                            pending = []
 
-                data_queue.task_done()
-
-            # Final commit for remaining batch
-            if batch_count > 0:
-                db.commit()
+                # Final commit for remaining batch
+                if pending:
+                    flush(db, pending)
 
         except Exception as e:
+            db.rollback()  # Don't leave a partial batch open
             error_holder.append(e)
         finally:
             try:
                 db.set_metadata("last_update", datetime.now().isoformat())
                 db.set_metadata("hours_lookback", str(config.hours_lookback))
+                if config.in_memory:
+                    db.backup_to(db_path)
+            except Exception as e:
+                error_holder.append(e)
             finally:
                 db.close()
 
@@ -257,60 +360,66 @@ def _do_update(client, experiments, db_dir, config, logger, incremental=None):
     writer = Thread(target=writer_thread)
     writer.start()
 
-    def fetch_and_queue(exp_id):
+    def fetch_and_queue(exp_id, fetch_executor=None):
         """Fetch experiment data and put in queue (blocks if queue full)."""
         try:
-            data = {
-                "experiment_id": exp_id,
-                "info": fetch_experiment_info(client, exp_id),
-                "logbook": fetch_logbook(client, exp_id),
-                "runtable": fetch_runtable(client, exp_id),
-                "file_manager": fetch_file_manager(client, exp_id),
-                "questionnaire": fetch_questionnaire(client, exp_id),
-                "workflow": fetch_workflow(client, exp_id),
-            }
+            data = fetch_experiment_data(client, exp_id, fetch_executor)
+            # Queue compact row tuples rather than the parsed payloads
+            data = prepare_experiment_rows(data)
+            size = _approximate_size(data)
         except Exception as e:
-            logger.warning(f"Error fetching {exp_id}: {e}")
+            logger.warning("Error fetching %s: %s", exp_id, e)
             data = {"experiment_id": exp_id, "error": str(e)}
+            size = 0
 
-        data_queue.put(data)  # Blocks if queue full - natural backpressure
+        data_queue.put(data, size)  # Blocks if queue full - natural backpressure
         return exp_id
 
     # Fetch in parallel with progress bar
-    if config.parallel_jobs > 1:
-        with ThreadPoolExecutor(max_workers=config.parallel_jobs) as executor:
-            futures = {executor.submit(fetch_and_queue, exp): exp for exp in experiments}
-
-            with click.progressbar(
-                as_completed(futures),
+    try:
+        if config.parallel_jobs > 1:
+            # Each experiment's requests run concurrently on a shared pool of
+            # parallel_jobs workers, so fewer experiments need to be in flight;
+            # runtable run details add a few more requests (see _pool_size)
+            experiment_workers = _experiment_workers(config.parallel_jobs)
+            with ThreadPoolExecutor(
+                max_workers=config.parallel_jobs
+            ) as fetch_executor, ThreadPoolExecutor(
+                max_workers=experiment_workers
+            ) as executor, click.progressbar(
                 length=len(experiments),
                 label="Fetching experiments",
-            ) as completed:
-                for future in completed:
-                    future.result()  # Propagate any exceptions
-    else:
-        with click.progressbar(experiments, label="Fetching experiments") as exps:
-            for exp_id in exps:
-                fetch_and_queue(exp_id)
+            ) as bar:
+                # map() re-raises any exception when its result is reached
+                for _ in executor.map(
+                    fetch_and_queue, experiments, repeat(fetch_executor)
+                ):
+                    bar.update(1)
+        else:
+            with click.progressbar(experiments, label="Fetching experiments") as exps:
+                for exp_id in exps:
+                    fetch_and_queue(exp_id)
+    finally:
+        # Sentinel signals the writer to finish; always sent so the
+        # blocking get() in the writer can't wait forever
+        data_queue.put(None)
 
-    # Signal writer to finish
-    stop_event.set()
-    data_queue.put(None)  # Sentinel value
     writer.join(timeout=300)  # Wait up to 5 minutes for writer to finish
 
     if error_holder:
         raise error_holder[0]
 
     error_count = len(failed_experiments)
-    logger.info(f"Update complete: {success_count} succeeded, {error_count} failed")
-    logger.info(f"Database saved to: {db_path}")
+    logger.info("Update complete: %d succeeded, %d failed", success_count, error_count)
+    logger.info("Database saved to: %s", db_path)
 
     # Write failed experiments to JSON file if any
     if failed_experiments:
+        for entry in failed_experiments:
+            entry["timestamp"] = datetime.fromtimestamp(entry["timestamp"]).isoformat()
         failed_file = db_dir / "failed_experiments.json"
-        with open(failed_file, "w") as f:
-            json.dump(failed_experiments, f, indent=2)
-        logger.warning(f"Wrote {error_count} failed experiments to: {failed_file}")
+        _write_json(failed_file, failed_experiments)
+        logger.warning("Wrote %d failed experiments to: %s", error_count, failed_file)
 
     return success_count, failed_experiments
 
@@ -321,6 +430,16 @@ def _do_update(client, experiments, db_dir, config, logger, incremental=None):
 @click.pass_context
 def fetch(ctx, experiment_id, output_dir):
     """Fetch data for a specific experiment."""
+    from .api import (
+        ElogClient,
+        fetch_experiment_info,
+        fetch_file_manager,
+        fetch_logbook,
+        fetch_questionnaire,
+        fetch_runtable,
+        fetch_workflow,
+    )
+
     logger = ctx.obj["logger"]
     config = ctx.obj["config"]
 
@@ -330,20 +449,20 @@ def fetch(ctx, experiment_id, output_dir):
     if not db_dir.exists():
         db_dir.mkdir(parents=True)
 
-    try:
-        client = ElogClient(
-            base_url=config.base_url,
-            kerberos_principal=config.kerberos_principal,
-        )
+    client = ElogClient(
+        base_url=config.base_url,
+        kerberos_principal=config.kerberos_principal,
+    )
 
+    try:
         # Find or create database
         existing_db = find_latest_database(db_dir)
         if existing_db:
             db_path = existing_db
-            logger.info(f"Using existing database: {db_path}")
+            logger.info("Using existing database: %s", db_path)
         else:
             db_path = db_dir / generate_db_name()
-            logger.info(f"Creating new database: {db_path}")
+            logger.info("Creating new database: %s", db_path)
 
         db = Database(db_path)
 
@@ -351,42 +470,50 @@ def fetch(ctx, experiment_id, output_dir):
         info = fetch_experiment_info(client, experiment_id)
         if info:
             db.insert_experiment(info)
-            logger.info(f"Fetched experiment info")
+            logger.info("Fetched experiment info")
 
         logbook = fetch_logbook(client, experiment_id)
         if logbook:
             db.insert_logbook(logbook)
-            logger.info(f"Fetched {len(logbook)} logbook entries")
+            logger.info("Fetched %d logbook entries", len(logbook))
 
         runtable = fetch_runtable(client, experiment_id)
         if runtable:
             db.insert_runtable(runtable)
-            logger.info(f"Fetched runtable data")
+            logger.info("Fetched runtable data")
 
         file_manager = fetch_file_manager(client, experiment_id)
         if file_manager:
             db.insert_file_manager(file_manager)
-            logger.info(f"Fetched file manager data ({len(file_manager.get('file_manager_records', []))} runs)")
+            logger.info(
+                "Fetched file manager data (%d runs)",
+                len(file_manager.get("file_manager_records", [])),
+            )
 
-        questionnaire = fetch_questionnaire(client, experiment_id)
+        questionnaire = fetch_questionnaire(client, experiment_id, info=info)
         if questionnaire:
             db.insert_questionnaire(questionnaire)
-            logger.info(f"Fetched questionnaire ({len(questionnaire.get('fields', []))} fields)")
+            logger.info(
+                "Fetched questionnaire (%d fields)",
+                len(questionnaire.get("fields", [])),
+            )
 
         workflow = fetch_workflow(client, experiment_id)
         if workflow:
             db.insert_workflow(workflow)
-            logger.info(f"Fetched {len(workflow.get('workflows', []))} workflows")
+            logger.info("Fetched %d workflows", len(workflow.get("workflows", [])))
 
         db.close()
-        logger.info(f"Data saved to: {db_path}")
+        logger.info("Data saved to: %s", db_path)
 
     except AuthenticationError as e:
         logger.error(str(e))
         sys.exit(1)
     except FetchElogError as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         sys.exit(1)
+    finally:
+        client.close()
 
 
 @cli.command()
@@ -410,7 +537,7 @@ def status(ctx, database_dir):
     click.echo(f"Size: {db_path.stat().st_size / 1024:.1f} KB")
     click.echo(f"Modified: {datetime.fromtimestamp(db_path.stat().st_mtime)}")
 
-    db = Database(db_path)
+    db = Database(db_path, readonly=True)
 
     # Get metadata
     last_update = db.get_metadata("last_update")
@@ -437,16 +564,19 @@ def status(ctx, database_dir):
 @click.pass_context
 def list_experiments(ctx, hours, exclude):
     """List recently updated experiments."""
+    from .api import ElogClient, fetch_updated_experiments
+
     logger = ctx.obj["logger"]
     config = ctx.obj["config"]
 
     offset_secs = int(hours * 3600)
 
+    client = ElogClient(
+        base_url=config.base_url,
+        kerberos_principal=config.kerberos_principal,
+    )
+
     try:
-        client = ElogClient(
-            base_url=config.base_url,
-            kerberos_principal=config.kerberos_principal,
-        )
         experiments = fetch_updated_experiments(
             client,
             offset_secs,
@@ -465,8 +595,10 @@ def list_experiments(ctx, hours, exclude):
         logger.error(str(e))
         sys.exit(1)
     except FetchElogError as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         sys.exit(1)
+    finally:
+        client.close()
 
 
 @cli.command()
@@ -476,6 +608,8 @@ def list_experiments(ctx, hours, exclude):
 @click.pass_context
 def retry(ctx, file, output_dir, parallel):
     """Retry fetching failed experiments from a previous run."""
+    from .api import ElogClient
+
     logger = ctx.obj["logger"]
     config = ctx.obj["config"]
 
@@ -486,7 +620,7 @@ def retry(ctx, file, output_dir, parallel):
     if output_dir:
         cli_args["database_dir"] = output_dir
 
-    config = Config.load(cli_args=cli_args)
+    config = config.with_overrides(cli_args)
 
     # Determine directories
     db_dir = config.database_dir or Path.cwd()
@@ -499,14 +633,14 @@ def retry(ctx, file, output_dir, parallel):
         failed_file = db_dir / "failed_experiments.json"
 
     if not failed_file.exists():
-        logger.error(f"Failed experiments file not found: {failed_file}")
+        logger.error("Failed experiments file not found: %s", failed_file)
         sys.exit(1)
 
     try:
         with open(failed_file) as f:
             failed_data = json.load(f)
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in {failed_file}: {e}")
+        logger.error("Invalid JSON in %s: %s", failed_file, e)
         sys.exit(1)
 
     # Extract experiment IDs
@@ -516,13 +650,16 @@ def retry(ctx, file, output_dir, parallel):
         logger.info("No failed experiments to retry.")
         return
 
-    logger.info(f"Retrying {len(experiments)} failed experiments...")
+    logger.info("Retrying %d failed experiments...", len(experiments))
+
+    client = ElogClient(
+        base_url=config.base_url,
+        kerberos_principal=config.kerberos_principal,
+        pool_size=_pool_size(config.parallel_jobs),
+    )
 
     try:
-        client = ElogClient(
-            base_url=config.base_url,
-            kerberos_principal=config.kerberos_principal,
-        )
+        client.authenticate()
 
         # Acquire lock
         lock_path = db_dir / ".elogfetch.lock"
@@ -538,8 +675,10 @@ def retry(ctx, file, output_dir, parallel):
         logger.error("Please run 'kinit' to authenticate.")
         sys.exit(1)
     except FetchElogError as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         sys.exit(1)
+    finally:
+        client.close()
 
 
 def main():
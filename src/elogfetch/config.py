@@ -2,22 +2,23 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
 import os
 import re
 
-import yaml
-
 
 DB_PREFIX = "elog_"
 DB_PATTERN = re.compile(r"^elog_(\d{4})_(\d{4})_(\d{4})\.db$")
 
 
-@dataclass
+@dataclass(frozen=True)
 class Config:
-    """Configuration for elogfetch."""
+    """Configuration for elogfetch.
+
+    Instances are immutable; the _merge_* steps return updated copies.
+    """
 
     # Fetch settings
     hours_lookback: float = 168.0  # 7 days default
@@ -26,7 +27,9 @@ class Config:
     # Execution settings
     parallel_jobs: int = 10
     queue_size: int = 100  # Bounded queue for memory-efficient streaming
+    queue_memory_mb: int = 512  # Approximate payload budget for the queue
     batch_commit_size: int = 50  # Experiments per commit batch
+    in_memory: bool = False  # Stage updates in RAM, write the file at the end
 
     # Paths
     database_dir: Path | None = None
@@ -47,7 +50,7 @@ class Config:
 
         # 1. Load from file
         if config_file and config_file.exists():
-            config = cls._merge_yaml(config, config_file)
+            config = cls._merge_file(config, config_file)
 
         # 2. Apply environment variables
         config = cls._merge_env(config)
@@ -58,64 +61,103 @@ class Config:
 
         return config
 
+    def with_overrides(self, cli_args: dict[str, Any]) -> "Config":
+        """Return a copy of this config with CLI arguments applied.
+
+        Avoids re-reading the config file and environment when a
+        subcommand adds its own options on top of the loaded config.
+        """
+        return self._merge_cli(self, cli_args)
+
     @classmethod
-    def _merge_yaml(cls, config: "Config", config_file: Path) -> "Config":
-        """Merge configuration from YAML file."""
-        with open(config_file) as f:
-            data = yaml.safe_load(f)
+    def _merge_file(cls, config: "Config", config_file: Path) -> "Config":
+        """Merge configuration from a YAML or TOML file."""
+        data = _read_config_file(config_file)
 
         if not data:
             return config
 
+        changes: dict[str, Any] = {}
         if "hours_lookback" in data:
-            config.hours_lookback = float(data["hours_lookback"])
+            changes["hours_lookback"] = float(data["hours_lookback"])
         if "exclude_patterns" in data:
-            config.exclude_patterns = data["exclude_patterns"]
+            changes["exclude_patterns"] = data["exclude_patterns"]
         if "parallel_jobs" in data:
-            config.parallel_jobs = int(data["parallel_jobs"])
+            changes["parallel_jobs"] = int(data["parallel_jobs"])
         if "queue_size" in data:
-            config.queue_size = int(data["queue_size"])
+            changes["queue_size"] = int(data["queue_size"])
+        if "queue_memory_mb" in data:
+            changes["queue_memory_mb"] = int(data["queue_memory_mb"])
         if "batch_commit_size" in data:
-            config.batch_commit_size = int(data["batch_commit_size"])
+            changes["batch_commit_size"] = int(data["batch_commit_size"])
+        if "in_memory" in data:
+            changes["in_memory"] = bool(data["in_memory"])
         if "database_dir" in data:
-            config.database_dir = Path(data["database_dir"]).expanduser()
+            changes["database_dir"] = Path(data["database_dir"]).expanduser()
         if "lock_timeout" in data:
-            config.lock_timeout = int(data["lock_timeout"])
+            changes["lock_timeout"] = int(data["lock_timeout"])
 
-        return config
+        return replace(config, **changes)
 
     @classmethod
     def _merge_env(cls, config: "Config") -> "Config":
         """Merge configuration from environment variables."""
+        changes: dict[str, Any] = {}
         if val := os.environ.get("FETCH_ELOG_HOURS_LOOKBACK"):
-            config.hours_lookback = float(val)
+            changes["hours_lookback"] = float(val)
         if val := os.environ.get("FETCH_ELOG_PARALLEL_JOBS"):
-            config.parallel_jobs = int(val)
+            changes["parallel_jobs"] = int(val)
         if val := os.environ.get("FETCH_ELOG_DATABASE_DIR"):
-            config.database_dir = Path(val).expanduser()
+            changes["database_dir"] = Path(val).expanduser()
         if val := os.environ.get("FETCH_ELOG_LOCK_TIMEOUT"):
-            config.lock_timeout = int(val)
+            changes["lock_timeout"] = int(val)
         if val := os.environ.get("FETCH_ELOG_BASE_URL"):
-            config.base_url = val
+            changes["base_url"] = val
         if val := os.environ.get("FETCH_ELOG_KERBEROS_PRINCIPAL"):
-            config.kerberos_principal = val
+            changes["kerberos_principal"] = val
 
-        return config
+        return replace(config, **changes)
 
     @classmethod
     def _merge_cli(cls, config: "Config", cli_args: dict[str, Any]) -> "Config":
         """Merge configuration from CLI arguments."""
+        changes: dict[str, Any] = {}
         if cli_args.get("hours") is not None:
-            config.hours_lookback = float(cli_args["hours"])
+            changes["hours_lookback"] = float(cli_args["hours"])
         if cli_args.get("exclude"):
-            config.exclude_patterns = cli_args["exclude"]
+            changes["exclude_patterns"] = cli_args["exclude"]
         if cli_args.get("parallel_jobs") is not None:
-            config.parallel_jobs = int(cli_args["parallel_jobs"])
+            changes["parallel_jobs"] = int(cli_args["parallel_jobs"])
         if cli_args.get("queue_size") is not None:
-            config.queue_size = int(cli_args["queue_size"])
+            changes["queue_size"] = int(cli_args["queue_size"])
         if cli_args.get("batch_commit_size") is not None:
-            config.batch_commit_size = int(cli_args["batch_commit_size"])
+            changes["batch_commit_size"] = int(cli_args["batch_commit_size"])
+        if cli_args.get("in_memory"):
+            changes["in_memory"] = True
         if cli_args.get("database_dir"):
-            config.database_dir = Path(cli_args["database_dir"]).expanduser()
+            changes["database_dir"] = Path(cli_args["database_dir"]).expanduser()
 
-        return config
+        return replace(config, **changes)
+
+
+def _read_config_file(config_file: Path) -> dict[str, Any] | None:
+    """Parse a config file, choosing TOML or YAML by its suffix.
+
+    Parsers are imported here rather than at module level so commands
+    that never read a config file don't pay for importing them.
+    """
+    if config_file.suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+
+        with open(config_file, "rb") as f:
+            return tomllib.load(f)
+
+    import yaml
+
+    # libyaml's C loader when PyYAML was built with it; same safe semantics
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_file) as f:
+        return yaml.load(f, Loader=loader)
@@ -2,6 +2,16 @@
 
 from __future__ import annotations
 
-from .database import Database, find_latest_database, generate_db_name
+from .database import (
+    Database,
+    find_latest_database,
+    generate_db_name,
+    prepare_experiment_rows,
+)
 
-__all__ = ["Database", "find_latest_database", "generate_db_name"]
+__all__ = [
+    "Database",
+    "find_latest_database",
+    "generate_db_name",
+    "prepare_experiment_rows",
+]
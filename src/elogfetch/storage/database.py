@@ -2,22 +2,58 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Generator, Iterable, Iterator
 
 from ..config import DB_PATTERN, DB_PREFIX
 from ..utils import get_logger
 
 logger = get_logger()
 
+# Stored in PRAGMA user_version; bump whenever _create_tables changes
+SCHEMA_VERSION = 1
+
+# Stay below SQLite's default host-parameter limit (999 before 3.32)
+SQLITE_MAX_PARAMS = 500
+
+# Per-connection prepared statement cache (the sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Maximum number of cached run IDs
+RUN_ID_CACHE_SIZE = 100_000
+
+# Memory-map up to this many bytes of the database file for reads
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Page cache per connection, in KiB (PRAGMA cache_size takes it negated)
+CACHE_SIZE_KIB = 64_000
+
+# Pages copied per step by backup_to()
+BACKUP_PAGES = 10_000
+
+# Indexes the writer itself queries (replace deletes by experiment_id);
+# dropping these during a bulk load would turn each delete into a scan
+_WRITE_PATH_INDEXES = frozenset({
+    "idx_production_run",
+    "idx_questionnaire_experiment",
+    "idx_run_experiment",
+    "idx_logbook_experiment",
+})
+
+# strftime format for database filenames (matches DB_PATTERN)
+_DB_NAME_FORMAT = f"{DB_PREFIX}%Y_%m%d_%H%M.db"
+
 
 def generate_db_name() -> str:
     """Generate a database filename with current timestamp."""
-    timestamp = datetime.now().strftime("%Y_%m%d_%H%M")
-    return f"{DB_PREFIX}{timestamp}.db"
+    return datetime.now().strftime(_DB_NAME_FORMAT)
 
 
 def find_latest_database(directory: Path) -> Path | None:
@@ -32,49 +68,389 @@ def find_latest_database(directory: Path) -> Path | None:
     if not directory.exists():
         return None
 
-    candidates = []
-    for path in directory.glob(f"{DB_PREFIX}*.db"):
-        if DB_PATTERN.match(path.name):
-            candidates.append(path)
+    # Names embed the creation timestamp (elog_YYYY_MMDD_HHMM.db), so the
+    # lexicographic maximum is the latest and no per-file stat() is needed
+    with os.scandir(directory) as entries:
+        latest = max(
+            (entry.name for entry in entries if DB_PATTERN.match(entry.name)),
+            default=None,
+        )
+
+    return directory / latest if latest else None
+
+
+_INSERT_EXPERIMENT_SQL = """
+    INSERT OR REPLACE INTO Experiment
+    (experiment_id, name, instrument, start_time, end_time, pi, pi_email,
+     leader_account, description, slack_channels, analysis_queues, urawi_proposal)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_QUESTIONNAIRE_SQL = """
+    INSERT OR REPLACE INTO Questionnaire
+    (experiment_id, proposal, category, field_id, field_name,
+     field_value, modified_time, modified_uid)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_WORKFLOW_SQL = """
+    INSERT INTO Workflow
+    (experiment_id, mongo_id, name, executable, trigger, location,
+     parameters, run_param_name, run_param_value, run_as_user)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_LOGBOOK_SQL = """
+    INSERT INTO Logbook
+    (experiment_id, run_id, timestamp, content, tags, author)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_RUN_DETECTOR_SQL = """
+    INSERT OR REPLACE INTO RunDetector (run_id, detector_id, status)
+    VALUES (?, ?, ?)
+"""
+
+_UPDATE_RUN_TIMES_SQL = "UPDATE Run SET start_time = ?, end_time = ? WHERE run_id = ?"
+
+_INSERT_OR_IGNORE_RUN_SQL = (
+    "INSERT OR IGNORE INTO Run (experiment_id, run_number) VALUES (?, ?)"
+)
+_INSERT_OR_IGNORE_DETECTOR_SQL = (
+    "INSERT OR IGNORE INTO Detector (detector_name) VALUES (?)"
+)
+# Upserts keyed on idx_production_run; COALESCE keeps values already
+# stored by the other data source (runtable vs. file manager)
+_UPSERT_PRODUCTION_SQL = """
+    INSERT INTO RunProductionData
+    (run_id, n_events, n_damaged, n_dropped, prod_start, prod_end)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(run_id) DO UPDATE SET
+        n_events = COALESCE(excluded.n_events, n_events),
+        n_damaged = COALESCE(excluded.n_damaged, n_damaged),
+        n_dropped = COALESCE(excluded.n_dropped, n_dropped),
+        prod_start = COALESCE(excluded.prod_start, prod_start),
+        prod_end = COALESCE(excluded.prod_end, prod_end)
+"""
+
+_UPSERT_FILES_SQL = """
+    INSERT INTO RunProductionData (run_id, number_of_files, total_size_bytes)
+    VALUES (?, ?, ?)
+    ON CONFLICT(run_id) DO UPDATE SET
+        number_of_files = COALESCE(excluded.number_of_files, number_of_files),
+        total_size_bytes = COALESCE(excluded.total_size_bytes, total_size_bytes)
+"""
+
+_DELETE_LOGBOOK_SQL = "DELETE FROM Logbook WHERE experiment_id = ?"
+_DELETE_QUESTIONNAIRE_SQL = "DELETE FROM Questionnaire WHERE experiment_id = ?"
+_DELETE_WORKFLOW_SQL = "DELETE FROM Workflow WHERE experiment_id = ?"
+
+# Tables counted by get_stats(), all in one statement
+_STATS_TABLES = ("Experiment", "Run", "Logbook", "Questionnaire", "Workflow")
+_STATS_SQL = "SELECT " + ", ".join(
+    f"(SELECT COUNT(*) FROM {table})" for table in _STATS_TABLES
+)
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    """Yield successive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _content_digest(rows: list[tuple]) -> str:
+    """Stable digest of prepared rows, used to skip rewriting unchanged data."""
+    payload = json.dumps(rows, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _digest_key(table: str, experiment_id: str) -> str:
+    """Metadata key holding the last written digest for a table's rows."""
+    return f"{table.lower()}_hash:{experiment_id}"
+
+
+def _experiment_row(data: dict[str, Any]) -> tuple:
+    """Build the Experiment row for experiment info."""
+    return (
+        data.get("experiment_id"),
+        data.get("name"),
+        data.get("instrument"),
+        data.get("start_time"),
+        data.get("end_time"),
+        data.get("pi"),
+        data.get("pi_email"),
+        data.get("leader_account"),
+        data.get("description"),
+        data.get("slack_channels"),
+        data.get("analysis_queues"),
+        data.get("urawi_proposal"),
+    )
+
+
+def _questionnaire_rows(data: dict[str, Any]) -> list[tuple]:
+    """Build Questionnaire rows for an experiment's questionnaire data."""
+    experiment_id = data.get("experiment_id")
+    proposal_number = data.get("proposal_number")
+    return [
+        (
+            experiment_id,
+            proposal_number,
+            field.get("category"),
+            field.get("field_id"),
+            field.get("field_name"),
+            field.get("field_value"),
+            field.get("modified_time"),
+            field.get("modified_uid"),
+        )
+        for field in data.get("fields", [])
+    ]
+
+
+def _workflow_rows(data: dict[str, Any]) -> list[tuple]:
+    """Build Workflow rows for an experiment's workflow definitions."""
+    experiment_id = data.get("experiment_id")
+    return [
+        (
+            experiment_id,
+            workflow.get("mongo_id"),
+            workflow.get("name"),
+            workflow.get("executable"),
+            workflow.get("trigger"),
+            workflow.get("location"),
+            json.dumps(workflow.get("parameters")),
+            workflow.get("run_param_name"),
+            workflow.get("run_param_value"),
+            workflow.get("run_as_user"),
+        )
+        for workflow in data.get("workflows", [])
+    ]
+
+
+def _logbook_rows(entries: list[dict[str, Any]]) -> list[tuple]:
+    """Build Logbook rows, keyed by run number rather than run ID."""
+    return [
+        (
+            entry.get("experiment_id"),
+            entry.get("run_number"),
+            entry.get("timestamp"),
+            entry.get("content"),
+            entry.get("tags"),
+            entry.get("author"),
+        )
+        for entry in entries
+    ]
 
-    if not candidates:
-        return None
 
-    return max(candidates, key=lambda p: p.stat().st_mtime)
+def prepare_experiment_rows(data: dict[str, Any]) -> dict[str, Any]:
+    """Flatten fetched experiment data into row tuples.
+
+    Runs in the fetch threads so the writer queue holds compact tuples
+    instead of the parsed API payloads. Run and detector IDs are still
+    resolved by the writer, so runtable and file manager data pass through.
+
+    Args:
+        data: Dictionary in the insert_experiment_batch format
+
+    Returns:
+        Dictionary accepted by Database.insert_prepared_many
+    """
+    info = data.get("info")
+    questionnaire = data.get("questionnaire")
+    workflow = data.get("workflow")
+    return {
+        "experiment_id": data.get("experiment_id"),
+        "experiment": _experiment_row(info) if info else None,
+        "logbook": _logbook_rows(data.get("logbook") or []),
+        "runtable": data.get("runtable") or None,
+        "file_manager": data.get("file_manager") or None,
+        "questionnaire": (
+            (questionnaire.get("experiment_id"), _questionnaire_rows(questionnaire))
+            if questionnaire else None
+        ),
+        "workflow": (
+            (workflow.get("experiment_id"), _workflow_rows(workflow))
+            if workflow else None
+        ),
+    }
 
 
 class Database:
     """SQLite database for storing elog data."""
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, readonly: bool = False):
         """Initialize database connection.
 
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file, or ":memory:" for
+                a staging database (see backup_to())
+            readonly: Open an existing database for queries only; the schema
+                is not created and writes are rejected
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(str(db_path))
+        self.readonly = readonly
+        if readonly:
+            uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(
+                uri,
+                uri=True,
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            self.conn.execute("PRAGMA query_only=1")
+            self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        else:
+            # Autocommit mode: transactions are opened explicitly with
+            # begin()/transaction() rather than implicitly before each DML
+            self.conn = sqlite3.connect(
+                str(db_path),
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
         self.conn.row_factory = sqlite3.Row
-        self._run_id_cache: dict[str, int] = {}
+        # LRU of (experiment_id, run_number) -> run_id, bounded by
+        # RUN_ID_CACHE_SIZE so long updates don't grow it without limit
+        self._run_id_cache: OrderedDict[tuple[str, int], int] = OrderedDict()
         self._detector_cache: dict[str, int] = {}
-        self._create_tables()
+        if not readonly:
+            self.enable_wal_mode()
+            self._create_tables()
 
     def enable_wal_mode(self) -> None:
         """Enable Write-Ahead Logging for better write performance.
 
         This allows reads to proceed concurrently with writes and
-        improves write performance for batch operations.
+        improves write performance for batch operations. Applied by
+        __init__ for every writable connection; close() converts the
+        file back to DELETE mode.
         """
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA synchronous=NORMAL")
-        self.conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
+        self.conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.conn.execute("PRAGMA wal_autocheckpoint=10000")  # pages
+
+    def tune_for_bulk_writes(self) -> None:
+        """Prepare the connection for a long-running bulk write session.
+
+        The cache, sync and mmap settings already come from
+        enable_wal_mode(); this only makes writes wait on a locked
+        database instead of failing immediately.
+        """
+        self.conn.execute("PRAGMA busy_timeout=30000")  # 30s
+
+    def drop_secondary_indexes(self) -> list[str]:
+        """Drop read-only secondary indexes ahead of a bulk load.
+
+        Indexes backing UNIQUE constraints and those used by the write path
+        are kept. Pass the returned statements to recreate_indexes() once
+        the load is committed.
+
+        Returns:
+            CREATE INDEX statements for the dropped indexes
+        """
+        cursor = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND sql IS NOT NULL"
+        )
+        dropped = [
+            (name, sql) for name, sql in cursor
+            if name not in _WRITE_PATH_INDEXES
+        ]
+        with self.transaction():
+            # Mark the schema incomplete so that if the indexes are never
+            # recreated (e.g. the process is killed), the next open reruns
+            # the CREATE INDEX IF NOT EXISTS script
+            self.conn.execute("PRAGMA user_version = 0")
+            for name, _ in dropped:
+                self.conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+        logger.debug("Dropped %d secondary indexes for bulk load", len(dropped))
+        return [sql for _, sql in dropped]
+
+    def recreate_indexes(self, statements: list[str]) -> None:
+        """Recreate indexes dropped by drop_secondary_indexes()."""
+        with self.transaction():
+            for sql in statements:
+                self.conn.execute(sql)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        logger.debug("Recreated %d secondary indexes", len(statements))
+
+    @contextmanager
+    def bulk_load(self) -> Generator[None, None, None]:
+        """Defer secondary index maintenance for a large load.
+
+        Drops the read-only secondary indexes on entry, then rebuilds them
+        and runs PRAGMA optimize on exit. If the block raises, any open
+        transaction is rolled back first so the rebuild isn't discarded
+        along with it.
+        """
+        statements = self.drop_secondary_indexes()
+        try:
+            yield
+        except BaseException:
+            if self.conn.in_transaction:
+                self.rollback()
+            raise
+        finally:
+            self.recreate_indexes(statements)
+            self.conn.execute("PRAGMA optimize")
+
+    def begin(self) -> None:
+        """Start an explicit write transaction for batch operations.
+
+        Uses BEGIN IMMEDIATE so the write lock is taken up front and all
+        inserts until the next commit() share a single journal sync.
+        Does nothing if a transaction is already open.
+        """
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+
+    @contextmanager
+    def transaction(self) -> Generator[None, None, None]:
+        """Run the enclosed writes in one BEGIN IMMEDIATE transaction.
+
+        Commits on success and rolls back on error. If a transaction is
+        already open (e.g. from begin()), the writes join it and the caller
+        stays responsible for committing.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.rollback()
+            raise
+        self.conn.commit()
 
     def commit(self) -> None:
         """Explicit commit for batch operations."""
         self.conn.commit()
 
+    def rollback(self) -> None:
+        """Discard the current transaction.
+
+        Cached run/detector IDs may refer to rows that were rolled back,
+        so the caches are cleared as well.
+        """
+        self.conn.rollback()
+        self._run_id_cache.clear()
+        self._detector_cache.clear()
+
     def _create_tables(self):
-        """Create all required tables."""
+        """Create all required tables.
+
+        Skipped when PRAGMA user_version already matches SCHEMA_VERSION,
+        so reopening an up-to-date database doesn't re-run the script.
+        """
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+
         self.conn.executescript("""
             CREATE TABLE IF NOT EXISTS Experiment (
                 experiment_id TEXT PRIMARY KEY,
@@ -185,6 +561,8 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_run_experiment ON Run(experiment_id);
             CREATE INDEX IF NOT EXISTS idx_logbook_experiment ON Logbook(experiment_id);
             CREATE INDEX IF NOT EXISTS idx_logbook_run ON Logbook(run_id);
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_production_run
+                ON RunProductionData(run_id);
 
             -- View for complete run information
             CREATE VIEW IF NOT EXISTS RunCompleteData AS
@@ -204,384 +582,419 @@ class Database:
             FROM Run r
             LEFT JOIN RunProductionData rpd ON r.run_id = rpd.run_id;
         """)
-        self.conn.commit()
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     def _get_or_create_run_id(self, experiment_id: str, run_number: int) -> int:
         """Get existing run_id or create new run entry."""
-        cache_key = f"{experiment_id}_{run_number}"
-        if cache_key in self._run_id_cache:
-            return self._run_id_cache[cache_key]
+        return self._get_or_create_run_ids(experiment_id, [run_number])[run_number]
 
-        cursor = self.conn.execute(
-            "SELECT run_id FROM Run WHERE experiment_id = ? AND run_number = ?",
-            (experiment_id, run_number),
-        )
-        result = cursor.fetchone()
+    def _get_or_create_run_ids(
+        self, experiment_id: str, run_numbers: Iterable[int]
+    ) -> dict[int, int]:
+        """Resolve run_ids for several runs of one experiment in bulk.
 
-        if result:
-            run_id = result[0]
-        else:
+        Missing runs are created with one INSERT OR IGNORE executemany()
+        and their IDs read back with chunked IN queries, instead of a
+        SELECT (and possibly an INSERT) per run.
+
+        Returns:
+            Mapping of run_number to run_id
+        """
+        cache = self._run_id_cache
+        run_ids = {}
+        missing = []
+        for run_number in dict.fromkeys(run_numbers):
+            key = (experiment_id, run_number)
+            run_id = cache.get(key)
+            if run_id is None:
+                missing.append(run_number)
+            else:
+                cache.move_to_end(key)
+                run_ids[run_number] = run_id
+
+        if not missing:
+            return run_ids
+
+        self.conn.executemany(
+            _INSERT_OR_IGNORE_RUN_SQL,
+            [(experiment_id, run_number) for run_number in missing],
+        )
+        for chunk in _chunks(missing, SQLITE_MAX_PARAMS):
+            placeholders = ",".join("?" * len(chunk))
             cursor = self.conn.execute(
-                "INSERT INTO Run (experiment_id, run_number) VALUES (?, ?)",
-                (experiment_id, run_number),
+                f"SELECT run_number, run_id FROM Run "
+                f"WHERE experiment_id = ? AND run_number IN ({placeholders})",
+                [experiment_id, *chunk],
             )
-            run_id = cursor.lastrowid
+            for run_number, run_id in cursor:
+                cache[(experiment_id, run_number)] = run_id
+                run_ids[run_number] = run_id
 
-        self._run_id_cache[cache_key] = run_id
-        return run_id
+        while len(cache) > RUN_ID_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        return run_ids
 
     def _get_or_create_detector_id(self, detector_name: str) -> int:
         """Get existing detector_id or create new detector entry."""
-        if detector_name in self._detector_cache:
-            return self._detector_cache[detector_name]
+        return self._get_or_create_detector_ids([detector_name])[detector_name]
 
-        cursor = self.conn.execute(
-            "SELECT detector_id FROM Detector WHERE detector_name = ?",
-            (detector_name,),
-        )
-        result = cursor.fetchone()
+    def _get_or_create_detector_ids(
+        self, detector_names: Iterable[str]
+    ) -> dict[str, int]:
+        """Resolve detector_ids for several detectors in bulk.
 
-        if result:
-            detector_id = result[0]
-        else:
+        Returns:
+            Mapping of detector_name to detector_id
+        """
+        detector_ids = {}
+        missing = []
+        for name in dict.fromkeys(detector_names):
+            detector_id = self._detector_cache.get(name)
+            if detector_id is None:
+                missing.append(name)
+            else:
+                detector_ids[name] = detector_id
+
+        if not missing:
+            return detector_ids
+
+        self.conn.executemany(
+            _INSERT_OR_IGNORE_DETECTOR_SQL, [(name,) for name in missing]
+        )
+        for chunk in _chunks(missing, SQLITE_MAX_PARAMS):
+            placeholders = ",".join("?" * len(chunk))
             cursor = self.conn.execute(
-                "INSERT INTO Detector (detector_name) VALUES (?)",
-                (detector_name,),
+                f"SELECT detector_name, detector_id FROM Detector "
+                f"WHERE detector_name IN ({placeholders})",
+                chunk,
             )
-            detector_id = cursor.lastrowid
+            for name, detector_id in cursor:
+                self._detector_cache[name] = detector_id
+                detector_ids[name] = detector_id
 
-        self._detector_cache[detector_name] = detector_id
-        return detector_id
+        return detector_ids
+
+    def _unchanged(self, table: str, experiment_id: str, rows: list[tuple]) -> bool:
+        """Check rows against the digest last written for this experiment.
+
+        Only the single-table insert_* methods used by `fetch` check digests,
+        since that is the path that rewrites rows already in the database.
+        Batch writes from `update` go to a new file or replace the experiment
+        (which deletes its digests), so hashing there could never skip.
+        If the rows differ, the new digest is recorded in the current
+        transaction and False is returned.
+        """
+        key = _digest_key(table, experiment_id)
+        digest = _content_digest(rows)
+        if self.get_metadata(key) == digest:
+            logger.debug("%s unchanged for: %s", table, experiment_id)
+            return True
+        self._set_metadata_no_commit(key, digest)
+        return False
 
     def insert_experiment(self, data: dict[str, Any]) -> None:
         """Insert or update experiment data."""
-        self._insert_experiment_no_commit(data)
-        self.conn.commit()
+        with self.transaction():
+            self._insert_experiment_no_commit(data)
 
     def _insert_experiment_no_commit(self, data: dict[str, Any]) -> None:
         """Insert experiment without committing (for batch operations)."""
-        self.conn.execute(
-            """
-            INSERT OR REPLACE INTO Experiment
-            (experiment_id, name, instrument, start_time, end_time, pi, pi_email,
-             leader_account, description, slack_channels, analysis_queues, urawi_proposal)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data.get("experiment_id"),
-                data.get("name"),
-                data.get("instrument"),
-                data.get("start_time"),
-                data.get("end_time"),
-                data.get("pi"),
-                data.get("pi_email"),
-                data.get("leader_account"),
-                data.get("description"),
-                data.get("slack_channels"),
-                data.get("analysis_queues"),
-                data.get("urawi_proposal"),
-            ),
-        )
-        logger.debug(f"Inserted experiment: {data.get('experiment_id')}")
+        self.conn.execute(_INSERT_EXPERIMENT_SQL, _experiment_row(data))
+        logger.debug("Inserted experiment: %s", data.get("experiment_id"))
 
     def insert_questionnaire(self, data: dict[str, Any]) -> None:
         """Insert questionnaire data as individual field records."""
-        self._insert_questionnaire_no_commit(data)
-        self.conn.commit()
+        with self.transaction():
+            self._insert_questionnaire_no_commit(data, check_digest=True)
 
-    def _insert_questionnaire_no_commit(self, data: dict[str, Any]) -> None:
+    def _insert_questionnaire_no_commit(
+        self, data: dict[str, Any], check_digest: bool = False
+    ) -> None:
         """Insert questionnaire without committing (for batch operations)."""
         experiment_id = data.get("experiment_id")
-        proposal_number = data.get("proposal_number")
-        fields = data.get("fields", [])
+        rows = _questionnaire_rows(data)
+        if check_digest and self._unchanged("Questionnaire", experiment_id, rows):
+            return
 
         # Delete existing questionnaire data for this experiment
-        self.conn.execute(
-            "DELETE FROM Questionnaire WHERE experiment_id = ?",
-            (experiment_id,),
-        )
+        self.conn.execute(_DELETE_QUESTIONNAIRE_SQL, (experiment_id,))
+        self.conn.executemany(_INSERT_QUESTIONNAIRE_SQL, rows)
 
-        for field in fields:
-            self.conn.execute(
-                """
-                INSERT OR REPLACE INTO Questionnaire
-                (experiment_id, proposal, category, field_id, field_name,
-                 field_value, modified_time, modified_uid)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    experiment_id,
-                    proposal_number,
-                    field.get("category"),
-                    field.get("field_id"),
-                    field.get("field_name"),
-                    field.get("field_value"),
-                    field.get("modified_time"),
-                    field.get("modified_uid"),
-                ),
-            )
-
-        logger.debug(f"Inserted {len(fields)} questionnaire fields for: {experiment_id}")
+        logger.debug(
+            "Inserted %d questionnaire fields for: %s", len(rows), experiment_id
+        )
 
     def insert_workflow(self, data: dict[str, Any]) -> None:
         """Insert workflow definitions."""
-        self._insert_workflow_no_commit(data)
-        self.conn.commit()
+        with self.transaction():
+            self._insert_workflow_no_commit(data, check_digest=True)
 
-    def _insert_workflow_no_commit(self, data: dict[str, Any]) -> None:
+    def _insert_workflow_no_commit(
+        self, data: dict[str, Any], check_digest: bool = False
+    ) -> None:
         """Insert workflow without committing (for batch operations)."""
         experiment_id = data.get("experiment_id")
+        rows = _workflow_rows(data)
+        if check_digest and self._unchanged("Workflow", experiment_id, rows):
+            return
 
         # Delete existing workflows for this experiment
-        self.conn.execute(
-            "DELETE FROM Workflow WHERE experiment_id = ?",
-            (experiment_id,),
-        )
-
-        for workflow in data.get("workflows", []):
-            self.conn.execute(
-                """
-                INSERT INTO Workflow
-                (experiment_id, mongo_id, name, executable, trigger, location,
-                 parameters, run_param_name, run_param_value, run_as_user)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    experiment_id,
-                    workflow.get("mongo_id"),
-                    workflow.get("name"),
-                    workflow.get("executable"),
-                    workflow.get("trigger"),
-                    workflow.get("location"),
-                    json.dumps(workflow.get("parameters")),
-                    workflow.get("run_param_name"),
-                    workflow.get("run_param_value"),
-                    workflow.get("run_as_user"),
-                ),
-            )
+        self.conn.execute(_DELETE_WORKFLOW_SQL, (experiment_id,))
+        self.conn.executemany(_INSERT_WORKFLOW_SQL, rows)
 
-        logger.debug(f"Inserted {len(data.get('workflows', []))} workflows for: {experiment_id}")
+        logger.debug("Inserted %d workflows for: %s", len(rows), experiment_id)
 
     def insert_logbook(self, entries: list[dict[str, Any]]) -> None:
         """Insert logbook entries."""
-        self._insert_logbook_no_commit(entries)
-        self.conn.commit()
+        with self.transaction():
+            self._insert_logbook_no_commit(entries, check_digest=True)
 
-    def _insert_logbook_no_commit(self, entries: list[dict[str, Any]]) -> None:
+    def _insert_logbook_no_commit(
+        self, entries: list[dict[str, Any]], check_digest: bool = False
+    ) -> None:
         """Insert logbook without committing (for batch operations)."""
         if not entries:
             return
 
-        experiment_id = entries[0].get("experiment_id")
+        self._insert_logbook_rows_no_commit(_logbook_rows(entries), check_digest)
+
+    def _insert_logbook_rows_no_commit(
+        self, rows: list[tuple], check_digest: bool = False
+    ) -> None:
+        """Insert prepared logbook rows for one experiment."""
+        if not rows:
+            return
+
+        experiment_id = rows[0][0]
+        if check_digest and self._unchanged("Logbook", experiment_id, rows):
+            return
 
         # Delete existing logbook entries for this experiment
-        self.conn.execute(
-            "DELETE FROM Logbook WHERE experiment_id = ?",
-            (experiment_id,),
+        self.conn.execute(_DELETE_LOGBOOK_SQL, (experiment_id,))
+
+        run_ids = self._get_or_create_run_ids(
+            experiment_id, (row[1] for row in rows if row[1] is not None)
         )
 
-        for entry in entries:
-            run_id = None
-            run_number = entry.get("run_number")
-            if run_number is not None:
-                run_id = self._get_or_create_run_id(entry["experiment_id"], run_number)
-
-            self.conn.execute(
-                """
-                INSERT INTO Logbook
-                (experiment_id, run_id, timestamp, content, tags, author)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+        # Generator arguments are consumed row by row, so the bound
+        # parameters never exist as a second full list
+        self.conn.executemany(
+            _INSERT_LOGBOOK_SQL,
+            (
                 (
-                    entry.get("experiment_id"),
-                    run_id,
-                    entry.get("timestamp"),
-                    entry.get("content"),
-                    entry.get("tags"),
-                    entry.get("author"),
-                ),
-            )
+                    exp_id,
+                    run_ids.get(run_number),
+                    timestamp,
+                    content,
+                    tags,
+                    author,
+                )
+                for exp_id, run_number, timestamp, content, tags, author in rows
+            ),
+        )
 
-        logger.debug(f"Inserted {len(entries)} logbook entries for: {experiment_id}")
+        logger.debug("Inserted %d logbook entries for: %s", len(rows), experiment_id)
 
     def insert_runtable(self, data: dict[str, Any]) -> None:
         """Insert run table data."""
-        self._insert_runtable_no_commit(data)
-        self.conn.commit()
+        with self.transaction():
+            self._insert_runtable_no_commit(data)
 
     def _insert_runtable_no_commit(self, data: dict[str, Any]) -> None:
         """Insert runtable without committing (for batch operations)."""
         experiment_id = data.get("experiment_id")
+        production = [
+            run_data for run_data in data.get("data_production", [])
+            if run_data.get("run_number") is not None
+        ]
+        detectors = [
+            detector_data for detector_data in data.get("detectors", [])
+            if detector_data.get("run_number") is not None
+        ]
+        run_ids = self._get_or_create_run_ids(
+            experiment_id,
+            [d["run_number"] for d in production]
+            + [d["run_number"] for d in detectors],
+        )
 
-        for run_data in data.get("data_production", []):
-            run_number = run_data.get("run_number")
-            if run_number is None:
-                continue
-
-            run_id = self._get_or_create_run_id(experiment_id, run_number)
-
-            # Update run times
-            self.conn.execute(
-                """
-                UPDATE Run SET start_time = ?, end_time = ?
-                WHERE run_id = ?
-                """,
-                (run_data.get("start_time"), run_data.get("end_time"), run_id),
-            )
-
-            # Check if production data exists
-            cursor = self.conn.execute(
-                "SELECT run_data_id FROM RunProductionData WHERE run_id = ?",
-                (run_id,),
-            )
-            existing = cursor.fetchone()
-
-            if existing:
-                # Update existing record
-                self.conn.execute(
-                    """
-                    UPDATE RunProductionData
-                    SET n_events = COALESCE(?, n_events),
-                        n_damaged = COALESCE(?, n_damaged),
-                        n_dropped = COALESCE(?, n_dropped),
-                        prod_start = COALESCE(?, prod_start),
-                        prod_end = COALESCE(?, prod_end)
-                    WHERE run_id = ?
-                    """,
-                    (
-                        run_data.get("n_events"),
-                        run_data.get("n_damaged"),
-                        run_data.get("n_dropped"),
-                        run_data.get("prod_start"),
-                        run_data.get("prod_end"),
-                        run_id,
-                    ),
+        self.conn.executemany(
+            _UPDATE_RUN_TIMES_SQL,
+            (
+                (
+                    run_data.get("start_time"),
+                    run_data.get("end_time"),
+                    run_ids[run_data["run_number"]],
                 )
-            else:
-                # Insert new record
-                self.conn.execute(
-                    """
-                    INSERT INTO RunProductionData
-                    (run_id, n_events, n_damaged, n_dropped, prod_start, prod_end)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        run_id,
-                        run_data.get("n_events"),
-                        run_data.get("n_damaged"),
-                        run_data.get("n_dropped"),
-                        run_data.get("prod_start"),
-                        run_data.get("prod_end"),
-                    ),
+                for run_data in production
+            ),
+        )
+        self.conn.executemany(
+            _UPSERT_PRODUCTION_SQL,
+            (
+                (
+                    run_ids[run_data["run_number"]],
+                    run_data.get("n_events"),
+                    run_data.get("n_damaged"),
+                    run_data.get("n_dropped"),
+                    run_data.get("prod_start"),
+                    run_data.get("prod_end"),
                 )
+                for run_data in production
+            ),
+        )
 
         # Insert detector data
-        for detector_data in data.get("detectors", []):
-            run_number = detector_data.get("run_number")
-            if run_number is None:
-                continue
-
-            run_id = self._get_or_create_run_id(experiment_id, run_number)
-
-            for key, value in detector_data.items():
-                if key == "run_number" or not key.strip():
-                    continue
-
-                detector_id = self._get_or_create_detector_id(key)
-                self.conn.execute(
-                    """
-                    INSERT OR REPLACE INTO RunDetector
-                    (run_id, detector_id, status)
-                    VALUES (?, ?, ?)
-                    """,
-                    (run_id, detector_id, value),
-                )
+        detector_ids = self._get_or_create_detector_ids(
+            key
+            for detector_data in detectors
+            for key in detector_data
+            if key != "run_number" and key.strip()
+        )
+        self.conn.executemany(
+            _INSERT_RUN_DETECTOR_SQL,
+            (
+                (run_ids[detector_data["run_number"]], detector_ids[key], value)
+                for detector_data in detectors
+                for key, value in detector_data.items()
+                if key != "run_number" and key.strip()
+            ),
+        )
 
-        logger.debug(f"Inserted runtable for: {experiment_id}")
+        logger.debug("Inserted runtable for: %s", experiment_id)
 
     def insert_file_manager(self, data: dict[str, Any]) -> None:
         """Insert file manager data (number_of_files, total_size_bytes per run)."""
-        self._insert_file_manager_no_commit(data)
-        self.conn.commit()
+        with self.transaction():
+            self._insert_file_manager_no_commit(data)
 
     def _insert_file_manager_no_commit(self, data: dict[str, Any]) -> None:
         """Insert file manager without committing (for batch operations)."""
         experiment_id = data.get("experiment_id")
-        records = data.get("file_manager_records", [])
-
-        for record in records:
-            run_number = record.get("run_number")
-            if run_number is None:
-                continue
-
-            run_id = self._get_or_create_run_id(experiment_id, run_number)
-
-            # Check if production data exists
-            cursor = self.conn.execute(
-                "SELECT run_data_id FROM RunProductionData WHERE run_id = ?",
-                (run_id,),
-            )
-            existing = cursor.fetchone()
+        records = [
+            record for record in data.get("file_manager_records", [])
+            if record.get("run_number") is not None
+        ]
+        run_ids = self._get_or_create_run_ids(
+            experiment_id, [record["run_number"] for record in records]
+        )
 
-            if existing:
-                # Update existing record
-                self.conn.execute(
-                    """
-                    UPDATE RunProductionData
-                    SET number_of_files = COALESCE(?, number_of_files),
-                        total_size_bytes = COALESCE(?, total_size_bytes)
-                    WHERE run_id = ?
-                    """,
-                    (
-                        record.get("number_of_files"),
-                        record.get("total_size_bytes"),
-                        run_id,
-                    ),
-                )
-            else:
-                # Insert new record
-                self.conn.execute(
-                    """
-                    INSERT INTO RunProductionData
-                    (run_id, number_of_files, total_size_bytes)
-                    VALUES (?, ?, ?)
-                    """,
-                    (
-                        run_id,
-                        record.get("number_of_files"),
-                        record.get("total_size_bytes"),
-                    ),
+        self.conn.executemany(
+            _UPSERT_FILES_SQL,
+            (
+                (
+                    run_ids[record["run_number"]],
+                    record.get("number_of_files"),
+                    record.get("total_size_bytes"),
                 )
+                for record in records
+            ),
+        )
 
-        logger.debug(f"Inserted file manager data for: {experiment_id}")
+        logger.debug("Inserted file manager data for: %s", experiment_id)
 
-    def insert_experiment_batch(self, data: dict[str, Any]) -> None:
-        """Insert all data for an experiment without committing.
+    def insert_experiment_batch(self, data: dict[str, Any], replace: bool = False) -> None:
+        """Insert all data for an experiment.
 
-        This is used by the streaming pipeline for batch commits.
-        Call commit() after inserting multiple experiments.
+        Joins the transaction opened by begin() if there is one, so several
+        experiments can share a commit; otherwise commits on its own.
 
         Args:
             data: Dictionary containing experiment_id and all data types:
                   info, logbook, runtable, file_manager, questionnaire, workflow
+            replace: If True, delete existing data for the experiment first
+        """
+        self.insert_prepared_many([prepare_experiment_rows(data)], replace=replace)
+
+    def insert_experiments_many(
+        self,
+        batch: list[dict[str, Any]],
+        replace: bool = False,
+    ) -> None:
+        """Insert data for several experiments in one transaction.
+
+        Joins the transaction opened by begin() if there is one.
+
+        Args:
+            batch: List of dictionaries in the insert_experiment_batch format
+            replace: If True, delete existing data for each experiment first
         """
-        if data.get("info"):
-            self._insert_experiment_no_commit(data["info"])
-        if data.get("logbook"):
-            self._insert_logbook_no_commit(data["logbook"])
-        if data.get("runtable"):
-            self._insert_runtable_no_commit(data["runtable"])
-        if data.get("file_manager"):
-            self._insert_file_manager_no_commit(data["file_manager"])
-        if data.get("questionnaire"):
-            self._insert_questionnaire_no_commit(data["questionnaire"])
-        if data.get("workflow"):
-            self._insert_workflow_no_commit(data["workflow"])
+        self.insert_prepared_many(
+            [prepare_experiment_rows(data) for data in batch], replace=replace
+        )
+
+    def insert_prepared_many(
+        self,
+        batch: list[dict[str, Any]],
+        replace: bool = False,
+    ) -> None:
+        """Insert rows built by prepare_experiment_rows in one transaction.
+
+        Joins the transaction opened by begin() if there is one.
+
+        Args:
+            batch: List of dictionaries returned by prepare_experiment_rows
+            replace: If True, delete existing data for each experiment first
+        """
+        with self.transaction():
+            self._insert_prepared_many_no_commit(batch, replace=replace)
+
+    def _insert_prepared_many_no_commit(
+        self,
+        batch: list[dict[str, Any]],
+        replace: bool = False,
+    ) -> None:
+        """Insert prepared rows without committing (for batch operations).
+
+        Experiment, questionnaire and workflow rows for the whole batch are
+        written with one executemany() per table; logbook, runtable and file
+        manager data are inserted per experiment since they resolve run IDs.
+        """
+        if replace:
+            self._delete_experiments_no_commit(
+                [rows["experiment_id"] for rows in batch]
+            )
+
+        self.conn.executemany(
+            _INSERT_EXPERIMENT_SQL,
+            [rows["experiment"] for rows in batch if rows["experiment"]],
+        )
+
+        for rows in batch:
+            self._insert_logbook_rows_no_commit(rows["logbook"])
+            if rows["runtable"]:
+                self._insert_runtable_no_commit(rows["runtable"])
+            if rows["file_manager"]:
+                self._insert_file_manager_no_commit(rows["file_manager"])
+
+        questionnaires = [
+            rows["questionnaire"] for rows in batch if rows["questionnaire"]
+        ]
+        workflows = [rows["workflow"] for rows in batch if rows["workflow"]]
+
+        self.conn.executemany(
+            _DELETE_QUESTIONNAIRE_SQL,
+            [(experiment_id,) for experiment_id, _ in questionnaires],
+        )
+        self.conn.executemany(
+            _INSERT_QUESTIONNAIRE_SQL,
+            [row for _, q_rows in questionnaires for row in q_rows],
+        )
+        self.conn.executemany(
+            _DELETE_WORKFLOW_SQL,
+            [(experiment_id,) for experiment_id, _ in workflows],
+        )
+        self.conn.executemany(
+            _INSERT_WORKFLOW_SQL,
+            [row for _, w_rows in workflows for row in w_rows],
+        )
+
+        logger.debug("Inserted batch of %d experiments", len(batch))
 
     def set_metadata(self, key: str, value: str) -> None:
         """Set a metadata value."""
-        self._set_metadata_no_commit(key, value)
-        self.conn.commit()
+        with self.transaction():
+            self._set_metadata_no_commit(key, value)
 
     def _set_metadata_no_commit(self, key: str, value: str) -> None:
         """Set metadata without committing (for batch operations)."""
@@ -601,11 +1014,8 @@ class Database:
 
     def get_stats(self) -> dict[str, int]:
         """Get database statistics."""
-        stats = {}
-        for table in ["Experiment", "Run", "Logbook", "Questionnaire", "Workflow"]:
-            cursor = self.conn.execute(f"SELECT COUNT(*) FROM {table}")
-            stats[table.lower()] = cursor.fetchone()[0]
-        return stats
+        row = self.conn.execute(_STATS_SQL).fetchone()
+        return {table.lower(): count for table, count in zip(_STATS_TABLES, row)}
 
     def delete_experiment(self, experiment_id: str) -> None:
         """Delete all data for an experiment from all tables.
@@ -613,33 +1023,101 @@ class Database:
         Args:
             experiment_id: The experiment ID to delete
         """
-        # Get run_ids for this experiment (needed for cascade delete)
-        cursor = self.conn.execute(
-            "SELECT run_id FROM Run WHERE experiment_id = ?",
-            (experiment_id,),
-        )
-        run_ids = [row[0] for row in cursor.fetchall()]
+        with self.transaction():
+            self._delete_experiment_no_commit(experiment_id)
 
-        # Delete in order (respecting foreign keys)
-        for run_id in run_ids:
-            self.conn.execute("DELETE FROM RunDetector WHERE run_id = ?", (run_id,))
-            self.conn.execute("DELETE FROM RunProductionData WHERE run_id = ?", (run_id,))
+    def _delete_experiment_no_commit(self, experiment_id: str) -> None:
+        """Delete experiment data without committing (for batch operations)."""
+        self._delete_experiments_no_commit([experiment_id])
 
-        self.conn.execute("DELETE FROM Logbook WHERE experiment_id = ?", (experiment_id,))
-        self.conn.execute("DELETE FROM Run WHERE experiment_id = ?", (experiment_id,))
-        self.conn.execute("DELETE FROM Questionnaire WHERE experiment_id = ?", (experiment_id,))
-        self.conn.execute("DELETE FROM Workflow WHERE experiment_id = ?", (experiment_id,))
-        self.conn.execute("DELETE FROM Experiment WHERE experiment_id = ?", (experiment_id,))
+    def _delete_experiments_no_commit(self, experiment_ids: list[str]) -> None:
+        """Delete data for several experiments without committing.
 
-        self.conn.commit()
+        Issues one DELETE per table for each chunk of IDs instead of one
+        per experiment (and per run). Run-scoped rows are matched with a
+        subquery on Run, so run IDs never round-trip through Python.
+        """
+        for ids in _chunks(experiment_ids, SQLITE_MAX_PARAMS):
+            placeholders = ",".join("?" * len(ids))
 
-        # Clear caches for this experiment
-        self._run_id_cache = {
-            k: v for k, v in self._run_id_cache.items()
-            if not k.startswith(f"{experiment_id}_")
-        }
+            # Delete in order (respecting foreign keys)
+            for table in ("RunDetector", "RunProductionData"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE run_id IN "
+                    f"(SELECT run_id FROM Run WHERE experiment_id IN ({placeholders}))",
+                    ids,
+                )
 
-        logger.debug(f"Deleted all data for experiment: {experiment_id}")
+            for table in ("Logbook", "Run", "Questionnaire", "Workflow", "Experiment"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE experiment_id IN ({placeholders})",
+                    ids,
+                )
+
+            # Forget content digests so the next insert rewrites the rows
+            for table in ("Logbook", "Questionnaire", "Workflow"):
+                self.conn.execute(
+                    f"DELETE FROM Metadata WHERE key IN ({placeholders})",
+                    [_digest_key(table, experiment_id) for experiment_id in ids],
+                )
+
+        # Clear caches for these experiments
+        deleted = set(experiment_ids)
+        for key in [k for k in self._run_id_cache if k[0] in deleted]:
+            del self._run_id_cache[key]
+
+        logger.debug("Deleted all data for %d experiments", len(experiment_ids))
+
+    def reader(self) -> "Database":
+        """Open a separate read-only connection to the same database file.
+
+        The single writer keeps this connection for its transactions; in
+        WAL mode readers opened here see the last committed state and
+        neither block nor wait on it. The caller closes the reader.
+
+        Returns:
+            Read-only Database for db_path
+        """
+        if str(self.db_path) == ":memory:":
+            raise ValueError("An in-memory database has no file to read from")
+        return Database(self.db_path, readonly=True)
+
+    def load_from(self, source: Path) -> None:
+        """Replace this database's contents with a copy of another file.
+
+        Used to seed an in-memory staging database from the base of an
+        incremental update. The schema is upgraded afterwards if the
+        source predates SCHEMA_VERSION.
+
+        Args:
+            source: Path to the database file to copy
+        """
+        src = sqlite3.connect(str(source))
+        try:
+            src.backup(self.conn)
+        finally:
+            src.close()
+        self._run_id_cache.clear()
+        self._detector_cache.clear()
+        self._create_tables()
+
+    def backup_to(self, path: Path, pages: int = BACKUP_PAGES) -> None:
+        """Copy this database to a file with the SQLite online backup API.
+
+        Lets an update stage everything in a ":memory:" database and write
+        the result to disk in one pass at the end, instead of paying for
+        WAL appends and checkpoints on every commit. Any existing file at
+        path is overwritten.
+
+        Args:
+            path: Destination database file
+            pages: Pages copied per backup step
+        """
+        dest = sqlite3.connect(str(path))
+        try:
+            self.conn.backup(dest, pages=pages)
+        finally:
+            dest.close()
 
     def checkpoint(self) -> None:
         """Force a WAL checkpoint to merge the -wal file into the main database."""
@@ -652,6 +1130,10 @@ class Database:
         the database can be read by any SQLite client without requiring
         write access to create -shm/-wal files.
         """
+        if self.readonly:
+            self.conn.close()
+            return
+
         try:
             # Checkpoint WAL to merge -wal file into main database
             self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
@@ -2,7 +2,16 @@
 
 from __future__ import annotations
 
-from .logging import get_logger, setup_logging
+from .logging import get_logger, setup_logging, teardown_logging
 from .locking import acquire_lock
+from .patterns import compile_patterns
+from .queues import ByteBoundedQueue
 
-__all__ = ["get_logger", "setup_logging", "acquire_lock"]
+__all__ = [
+    "get_logger",
+    "setup_logging",
+    "teardown_logging",
+    "acquire_lock",
+    "compile_patterns",
+    "ByteBoundedQueue",
+]
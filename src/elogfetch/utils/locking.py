@@ -36,7 +36,6 @@ def acquire_lock(
         try:
             fcntl.flock(lock_file, flags)
         except BlockingIOError:
-            lock_file.close()
             raise LockError(
                 f"Another instance is already running (lock: {lock_path})"
             )
@@ -44,8 +43,6 @@ def acquire_lock(
         yield lock_file
 
     finally:
-        try:
-            fcntl.flock(lock_file, fcntl.LOCK_UN)
-        except Exception:
-            pass
+        # Closing the only descriptor releases the flock; subprocesses
+        # don't inherit it (close_fds defaults to True)
         lock_file.close()
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 LOGGER_NAME = "elogfetch"
 
+# Runs the real handlers on its own thread; see setup_logging()
+_listener: QueueListener | None = None
+
 
 def setup_logging(
     level: int = logging.INFO,
@@ -21,13 +27,20 @@ def setup_logging(
         log_file: Optional path to log file
         quiet: If True, suppress console output
 
+    Log calls only enqueue the record; a QueueListener thread runs the
+    console and file handlers, so fetch threads never wait on their I/O
+    or on each other's handler locks.
+
     Returns:
         Configured logger instance
     """
+    global _listener
+
     logger = logging.getLogger(LOGGER_NAME)
     logger.setLevel(level)
 
     # Clear any existing handlers
+    teardown_logging()
     logger.handlers.clear()
 
     formatter = logging.Formatter(
@@ -35,19 +48,44 @@ def setup_logging(
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
+    handlers = []
+
     if not quiet:
         console = logging.StreamHandler(sys.stdout)
         console.setFormatter(formatter)
-        logger.addHandler(console)
+        handlers.append(console)
 
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if handlers:
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
 
     return logger
 
 
+@atexit.register
+def teardown_logging() -> None:
+    """Flush queued records and stop the logging thread, if running."""
+    global _listener
+
+    if _listener is not None:
+        # Detach the queue first so later records aren't left piling up in it
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in logger.handlers[:]:
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def get_logger() -> logging.Logger:
     """Get the elogfetch logger instance."""
     return logging.getLogger(LOGGER_NAME)
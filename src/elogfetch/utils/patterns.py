@@ -0,0 +1,26 @@
+"""Shell-style pattern matching utilities for elogfetch."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from functools import lru_cache
+from typing import Iterable
+
+
+def compile_patterns(patterns: Iterable[str]) -> re.Pattern[str]:
+    """Compile shell-style patterns into a single case-insensitive regex.
+
+    Args:
+        patterns: Shell-style wildcard patterns (``*``, ``?``, ``[seq]``)
+
+    Returns:
+        Compiled regex matching any of the patterns in full
+    """
+    return _compile_patterns(tuple(patterns))
+
+
+@lru_cache(maxsize=32)
+def _compile_patterns(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    alternation = "|".join(f"(?:{fnmatch.translate(p)})" for p in patterns)
+    return re.compile(alternation, re.IGNORECASE)
@@ -0,0 +1,72 @@
+"""Queue utilities for elogfetch."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any
+
+
+class ByteBoundedQueue:
+    """FIFO queue bounded by item count and by approximate payload bytes.
+
+    Producers block in put() while the queue is full by either measure, so
+    memory stays bounded even when item sizes vary widely. An item is always
+    admitted into an empty queue, so a single payload larger than max_bytes
+    cannot deadlock the pipeline.
+    """
+
+    def __init__(self, maxsize: int = 0, max_bytes: int = 0):
+        """Create the queue.
+
+        Args:
+            maxsize: Maximum number of items, or 0 for no limit
+            max_bytes: Maximum total size of queued items, or 0 for no limit
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._items: deque[tuple[Any, int]] = deque()
+        self._bytes = 0
+        self._cond = threading.Condition()
+
+    def _full(self, size: int) -> bool:
+        if not self._items:
+            return False
+        if self.maxsize and len(self._items) >= self.maxsize:
+            return True
+        return bool(self.max_bytes) and self._bytes + size > self.max_bytes
+
+    def put(self, item: Any, size: int = 0) -> None:
+        """Add an item, blocking while the queue is full.
+
+        Args:
+            item: Item to enqueue
+            size: Approximate size of the item in bytes
+        """
+        with self._cond:
+            while self._full(size):
+                self._cond.wait()
+            self._items.append((item, size))
+            self._bytes += size
+            self._cond.notify_all()
+
+    def get(self) -> Any:
+        """Remove and return the oldest item, blocking while empty."""
+        with self._cond:
+            while not self._items:
+                self._cond.wait()
+            item, size = self._items.popleft()
+            self._bytes -= size
+            self._cond.notify_all()
+            return item
+
+    def qsize(self) -> int:
+        """Return the number of queued items."""
+        with self._cond:
+            return len(self._items)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate total size of the queued items in bytes."""
+        with self._cond:
+            return self._bytes
@@ -2,8 +2,46 @@
 
 from __future__ import annotations
 
+import shutil
+from pathlib import Path
+
 import pytest
 
+from elogfetch.storage import Database
+
+
+@pytest.fixture(scope="session")
+def _db_template(tmp_path_factory):
+    """Empty database with the schema already created, built once per session."""
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    Database(path).close()
+    return path
+
+
+@pytest.fixture
+def fresh_db(tmp_path, _db_template):
+    """Open a private copy of the template database at tmp_path/test.db.
+
+    The copy already carries the current schema version, so opening it
+    skips the CREATE TABLE/INDEX statements. Commits skip fsync since the
+    file is thrown away after the test; the journal mode is left as WAL.
+    Closed on teardown, even if the test fails.
+    """
+    db_path = tmp_path / "test.db"
+    shutil.copyfile(_db_template, db_path)
+    db = Database(db_path)
+    db.conn.execute("PRAGMA synchronous=OFF")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def mem_db():
+    """Open an in-memory database for tests that only query through db.conn."""
+    db = Database(Path(":memory:"))
+    yield db
+    db.close()
+
 
 @pytest.fixture
 def sample_experiment_data():
@@ -2,140 +2,415 @@
 
 from __future__ import annotations
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from elogfetch.api.experiment_data import fetch_experiment_data
 from elogfetch.api.experiments import _filter_experiments
+from elogfetch.api.file_manager import _aggregate_by_run
+from elogfetch.api.info import _parse_contact_info
+from elogfetch.api.logbook import _transform_entries, fetch_logbooks
+from elogfetch.api.questionnaire import _parse_questionnaire_fields
+from elogfetch.api.runtable import fetch_runtable
+from elogfetch.exceptions import APIError
 
 
 class TestFilterExperiments:
     """Tests for experiment filtering functionality."""
 
-    def test_filter_experiments_single_wildcard(self):
-        """Test that single wildcard pattern excludes matching experiments."""
-        experiments = ["test123", "test456", "cxic00123", "mfxc00456"]
-        patterns = ["test*"]
-
-        result = _filter_experiments(experiments, patterns)
-
-        assert "test123" not in result
-        assert "test456" not in result
-        assert "cxic00123" in result
-        assert "mfxc00456" in result
-
-    def test_filter_experiments_multiple_patterns(self):
-        """Test that multiple patterns work correctly together."""
-        experiments = [
-            "test123",
-            "txi00456",
-            "cxic00123",
-            "mfxc00456",
-            "debug789",
+    @pytest.mark.parametrize(
+        "experiments, patterns, expected",
+        [
+            (
+                ["test123", "test456", "cxic00123", "mfxc00456"],
+                ["test*"],
+                ["cxic00123", "mfxc00456"],
+            ),
+            (
+                ["test123", "txi00456", "cxic00123", "mfxc00456", "debug789"],
+                ["txi*", "test*"],
+                ["cxic00123", "mfxc00456", "debug789"],
+            ),
+            (
+                ["TEST123", "Test456", "test789", "CXIc00123"],
+                ["test*"],
+                ["CXIc00123"],
+            ),
+            (
+                ["cxic00123", "mfxc00456", "xppc00789"],
+                ["test*", "debug*"],
+                ["cxic00123", "mfxc00456", "xppc00789"],
+            ),
+            (
+                ["cxi1", "cxi12", "cxi123", "mfx1"],
+                ["cxi?"],
+                ["cxi12", "cxi123", "mfx1"],
+            ),
+            (
+                ["test", "test123", "testing", "cxic00123"],
+                ["test"],
+                ["test123", "testing", "cxic00123"],
+            ),
+            (
+                ["cxic00123", "mfxc00456", "test123"],
+                [],
+                ["cxic00123", "mfxc00456", "test123"],
+            ),
+            ([], ["test*"], []),
+            (["test1", "test2", "test3"], ["test*"], []),
+            (
+                ["cxic00123", "cxic00456", "cxi_test_123", "mfxc00789"],
+                ["cxi*123"],
+                ["cxic00456", "mfxc00789"],
+            ),
+            (
+                ["z_exp", "a_exp", "m_exp", "test1", "b_exp"],
+                ["test*"],
+                ["z_exp", "a_exp", "m_exp", "b_exp"],
+            ),
+            (["cxi.1", "cxix1", "mfx+1"], ["cxi.1", "mfx+*"], ["cxix1"]),
+            (["cxia1", "cxib1", "cxic1"], ["cxi[ab]1"], ["cxic1"]),
+            (["a" * 32, "a" * 31 + "b"], ["*" * 16 + "b", "x**y"], ["a" * 32]),
+        ],
+        ids=[
+            "single_wildcard",
+            "multiple_patterns",
+            "case_insensitive",
+            "no_match",
+            "question_mark",
+            "exact_match",
+            "empty_patterns",
+            "empty_experiments",
+            "all_filtered",
+            "complex_pattern",
+            "preserves_order",
+            "literal_dot",
+            "character_class",
+            "many_stars",
+        ],
+    )
+    def test_filter_experiments(self, experiments, patterns, expected):
+        """Test that matching experiments are dropped and the rest keep order."""
+        assert _filter_experiments(experiments, patterns) == expected
+
+    def test_filter_experiments_logs_shell_patterns(self, caplog):
+        """Test that the exclusion log names the patterns, not the regex."""
+        experiments = ["txi123", "TXI456", "mfxc00456"]
+
+        with caplog.at_level(logging.INFO, logger="elogfetch"):
+            _filter_experiments(experiments, ["txi*"])
+
+        assert "Excluded 2 experiments by patterns ['txi*']" in caplog.text
+
+
+class TestAggregateByRun:
+    """Tests for per-run file aggregation."""
+
+    def test_aggregate_by_run(self):
+        """Test counts and sizes per run, sorted, skipping files without a run."""
+        files = [
+            {"run_num": 2, "size": 100},
+            {"run_num": 1, "size": 10},
+            {"run_num": 2, "size": None},
+            {"size": 5},
+            {"run_num": 1, "size": 20},
         ]
-        patterns = ["txi*", "test*"]
 
-        result = _filter_experiments(experiments, patterns)
+        assert _aggregate_by_run(files) == [
+            {"run_number": 1, "number_of_files": 2, "total_size_bytes": 30},
+            {"run_number": 2, "number_of_files": 2, "total_size_bytes": 100},
+        ]
 
-        assert "test123" not in result
-        assert "txi00456" not in result
-        assert "cxic00123" in result
-        assert "mfxc00456" in result
-        assert "debug789" in result
 
-    def test_filter_experiments_case_insensitive(self):
-        """Test that pattern matching is case-insensitive."""
-        experiments = ["TEST123", "Test456", "test789", "CXIc00123"]
-        patterns = ["test*"]
+class TestParseContactInfo:
+    """Tests for splitting contact_info into PI name and email."""
+
+    @pytest.mark.parametrize(
+        "contact_info, expected",
+        [
+            ("Jane Doe (jdoe@example.com)", ("Jane Doe", "jdoe@example.com")),
+            ("Jane Doe", ("Jane Doe", None)),
+            ("Jane (JD) Doe (jdoe@example.com)", ("Jane", "JD")),
+            ("Jane Doe (unterminated", ("Jane Doe (unterminated", None)),
+            ("", (None, None)),
+            (None, (None, None)),
+        ],
+    )
+    def test_parse_contact_info(self, contact_info, expected):
+        """Test that the first parenthesized part is taken as the email."""
+        assert _parse_contact_info(contact_info) == expected
+
+
+class TestParseQuestionnaireFields:
+    """Tests for flattening questionnaire categories into field records."""
+
+    def test_strips_only_the_category_prefix(self):
+        """Test that field names drop the leading category prefix only."""
+        data = {
+            "pcdssetup": [
+                {"id": "pcdssetup-motors", "val": "3"},
+                {"id": "pcdssetup-mode-pcdssetup-x", "val": "a"},
+                {"id": "other-field", "val": "b"},
+                {"val": "no id"},
+                "not a dict",
+            ],
+            "meta": {"not": "a list"},
+        }
+
+        fields = _parse_questionnaire_fields(data)
+
+        assert [f["field_name"] for f in fields] == [
+            "motors",
+            "mode-pcdssetup-x",
+            "other-field",
+        ]
+        assert fields[0]["field_value"] == "3"
+        assert fields[0]["category"] == "pcdssetup"
+
+
+class _FakeLogbookClient:
+    """Minimal stand-in for ElogClient returning canned logbook responses."""
+
+    def get(self, endpoint, params=None, require_auth=True):
+        experiment_id = endpoint.split("/")[4]
+        return {
+            "success": True,
+            "value": [
+                {
+                    "_id": f"{experiment_id}-1",
+                    "insert_time": "2024-01-15T10:30:00",
+                    "run_num": 1,
+                    "content": "entry",
+                    "tags": ["a", "b"],
+                    "author": "jsmith",
+                },
+            ],
+        }
+
+
+class TestFetchLogbooks:
+    """Tests for concurrent logbook fetching."""
+
+    def test_fetch_logbooks_maps_each_experiment(self):
+        """Test that results are keyed by experiment ID."""
+        experiments = ["cxic00123", "mfxc00456", "xppc00789"]
 
-        result = _filter_experiments(experiments, patterns)
+        result = fetch_logbooks(_FakeLogbookClient(), experiments, max_workers=2)
+
+        assert list(result) == experiments
+        for exp in experiments:
+            assert len(result[exp]) == 1
+            assert result[exp][0]["experiment_id"] == exp
+            assert result[exp][0]["tags"] == "a,b"
+
+    def test_fetch_logbooks_empty(self):
+        """Test that an empty experiment list returns an empty mapping."""
+        assert fetch_logbooks(_FakeLogbookClient(), []) == {}
+
+    def test_fetch_logbooks_accepts_generator(self):
+        """Test that a one-shot iterable still maps every experiment."""
+        experiments = ["cxic00123", "mfxc00456"]
+
+        result = fetch_logbooks(_FakeLogbookClient(), (exp for exp in experiments))
+
+        assert list(result) == experiments
+        assert all(result[exp][0]["experiment_id"] == exp for exp in experiments)
+
+
+class _FakeRunClient:
+    """Minimal stand-in for ElogClient returning canned run responses."""
+
+    def get(self, endpoint, params=None, require_auth=True):
+        if endpoint.endswith("/runs"):
+            return {"success": True, "value": [{"num": n} for n in (1, 2, 3)]}
+
+        run_num = int(endpoint.rsplit("/", 1)[1])
+        if run_num == 2:
+            raise APIError("boom")
+        return {
+            "success": True,
+            "value": {
+                "begin_time": "2024-01-15T10:30:00+00:00",
+                "params": {
+                    "DAQ Detector Totals/Events": run_num * 100,
+                    f"DAQ Detectors/det{run_num}": True,
+                },
+            },
+        }
+
+
+class TestFetchRuntable:
+    """Tests for run table fetching."""
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_runs_kept_in_order(self, max_workers):
+        """Test that run details are fetched concurrently in run order."""
+        result = fetch_runtable(_FakeRunClient(), "cxic00123", max_workers)
+
+        production = result["data_production"]
+        assert [p["run_number"] for p in production] == [1, 3]
+        assert [p["n_events"] for p in production] == [100, 300]
+        assert production[0]["start_time"] == "2024-01-15 10:30:00"
+        assert result["detectors"][1] == {
+            "run_number": 3,
+            "DAQ Detectors/det1": "Unchecked",
+            "DAQ Detectors/det3": "Checked",
+        }
+
+
+class TestTransformEntries:
+    """Tests for logbook entry transformation and run inference."""
+
+    @staticmethod
+    def _entry(entry_id, insert_time, content="", run_num=None, tags=None):
+        return {
+            "_id": entry_id,
+            "insert_time": insert_time,
+            "run_num": run_num,
+            "content": content,
+            "tags": tags,
+            "author": "jsmith",
+        }
+
+    def test_transform_sorts_by_timestamp(self):
+        """Test that entries are emitted in timestamp order."""
+        raw = [
+            self._entry("b", "2024-01-15T11:00:00"),
+            self._entry("a", "2024-01-15T10:00:00"),
+        ]
 
-        assert "TEST123" not in result
-        assert "Test456" not in result
-        assert "test789" not in result
-        assert "CXIc00123" in result
+        result = _transform_entries("cxic00123", raw)
 
-    def test_filter_experiments_no_match(self):
-        """Test that unmatched experiments are preserved."""
-        experiments = ["cxic00123", "mfxc00456", "xppc00789"]
-        patterns = ["test*", "debug*"]
+        assert [e["log_id"] for e in result] == ["a", "b"]
+        assert all(e["experiment_id"] == "cxic00123" for e in result)
 
-        result = _filter_experiments(experiments, patterns)
+    def test_transform_infers_run_from_preceding_boundary(self):
+        """Test that entries inherit the run of the latest prior boundary."""
+        raw = [
+            self._entry("before", "2024-01-15T09:00:00"),
+            self._entry("r1", "2024-01-15T10:00:00", run_num=1),
+            self._entry("during1", "2024-01-15T10:30:00"),
+            self._entry("r2", "2024-01-15T11:00:00", run_num=2),
+            self._entry("after", "2024-01-15T12:00:00"),
+        ]
 
-        assert len(result) == 3
-        assert result == experiments
+        result = {e["log_id"]: e["run_number"] for e in _transform_entries("x", raw)}
+
+        assert result == {
+            "before": None,
+            "r1": 1,
+            "during1": 1,
+            "r2": 2,
+            "after": 2,
+        }
+
+    def test_transform_detects_run_from_content(self):
+        """Test that 'Run number N: running' messages act as boundaries."""
+        raw = [
+            self._entry("msg", "2024-01-15T10:00:00", "Run Number 7: Running"),
+            self._entry("note", "2024-01-15T10:05:00", "beam looks good"),
+        ]
 
-    def test_filter_experiments_question_mark(self):
-        """Test that ? wildcard matches single character."""
-        experiments = ["cxi1", "cxi12", "cxi123", "mfx1"]
-        patterns = ["cxi?"]
+        result = {e["log_id"]: e["run_number"] for e in _transform_entries("x", raw)}
 
-        result = _filter_experiments(experiments, patterns)
+        assert result == {"msg": 7, "note": 7}
 
-        assert "cxi1" not in result  # Matches cxi?
-        assert "cxi12" in result  # Doesn't match (2 chars after cxi)
-        assert "cxi123" in result  # Doesn't match (3 chars after cxi)
-        assert "mfx1" in result  # Different prefix
+    def test_transform_ignores_run_number_after_colon(self):
+        """Test that a run number mentioned after the first colon is no boundary."""
+        raw = [
+            self._entry("r1", "2024-01-15T10:00:00", run_num=1),
+            self._entry(
+                "note",
+                "2024-01-15T10:05:00",
+                "Note: still running, compare with run number 12",
+            ),
+            self._entry("later", "2024-01-15T10:10:00", "beam looks good"),
+        ]
 
-    def test_filter_experiments_exact_match(self):
-        """Test exact match pattern without wildcards."""
-        experiments = ["test", "test123", "testing", "cxic00123"]
-        patterns = ["test"]
+        result = {e["log_id"]: e["run_number"] for e in _transform_entries("x", raw)}
 
-        result = _filter_experiments(experiments, patterns)
+        assert result == {"r1": 1, "note": 1, "later": 1}
 
-        assert "test" not in result  # Exact match
-        assert "test123" in result  # Not an exact match
-        assert "testing" in result  # Not an exact match
-        assert "cxic00123" in result
+    def test_transform_null_timestamp_sorts_first(self):
+        """Test that entries with a null insert_time don't break sorting."""
+        raw = [
+            self._entry("b", "2024-01-15T11:00:00"),
+            self._entry("a", None),
+        ]
+
+        result = _transform_entries("x", raw)
 
-    def test_filter_experiments_empty_patterns(self):
-        """Test that empty pattern list returns all experiments."""
-        experiments = ["cxic00123", "mfxc00456", "test123"]
-        patterns = []
+        assert [e["log_id"] for e in result] == ["a", "b"]
 
-        result = _filter_experiments(experiments, patterns)
+    def test_transform_formats_tags(self):
+        """Test that tag lists are joined and empty tags become None."""
+        raw = [
+            self._entry("a", "2024-01-15T10:00:00", tags=["x", "y"]),
+            self._entry("b", "2024-01-15T11:00:00", tags=[]),
+        ]
 
-        assert result == experiments
+        result = _transform_entries("x", raw)
 
-    def test_filter_experiments_empty_experiments(self):
-        """Test that empty experiment list returns empty list."""
-        experiments = []
-        patterns = ["test*"]
+        assert result[0]["tags"] == "x,y"
+        assert result[1]["tags"] is None
 
-        result = _filter_experiments(experiments, patterns)
 
-        assert result == []
+class _EmptyClient:
+    """Stand-in for ElogClient that answers every request with no data."""
 
-    def test_filter_experiments_all_filtered(self):
-        """Test when all experiments match filter patterns."""
-        experiments = ["test1", "test2", "test3"]
-        patterns = ["test*"]
+    def get(self, endpoint, params=None, require_auth=True):
+        return {"success": True, "value": {} if endpoint.endswith("/info") else []}
 
-        result = _filter_experiments(experiments, patterns)
 
-        assert result == []
+class TestFetchExperimentData:
+    """Tests for fetching all data types of an experiment."""
 
-    def test_filter_experiments_complex_pattern(self):
-        """Test complex pattern with multiple wildcards."""
-        experiments = [
-            "cxic00123",
-            "cxic00456",
-            "cxi_test_123",
-            "mfxc00789",
-        ]
-        patterns = ["cxi*123"]
+    def test_keys_match_database_batch_format(self):
+        """Test that every data type is present under its batch key."""
+        data = fetch_experiment_data(_EmptyClient(), "cxic00123")
+
+        assert set(data) == {
+            "experiment_id",
+            "info",
+            "logbook",
+            "runtable",
+            "file_manager",
+            "questionnaire",
+            "workflow",
+        }
+        assert data["experiment_id"] == "cxic00123"
+
+    def test_executor_matches_sequential(self):
+        """Test that concurrent fetching returns the same result."""
+        sequential = fetch_experiment_data(_EmptyClient(), "cxic00123")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            concurrent = fetch_experiment_data(_EmptyClient(), "cxic00123", executor)
+
+        assert concurrent == sequential
 
-        result = _filter_experiments(experiments, patterns)
+    @pytest.mark.parametrize("workers", [None, 3])
+    def test_questionnaire_reuses_info(self, workers):
+        """Test that /ws/info is requested once and its PNR reused."""
 
-        assert "cxic00123" not in result  # Matches cxi*123
-        assert "cxi_test_123" not in result  # Matches cxi*123
-        assert "cxic00456" in result  # Doesn't end in 123
-        assert "mfxc00789" in result  # Different prefix
+        class RecordingClient(_EmptyClient):
+            def __init__(self):
+                self.endpoints = []
 
-    def test_filter_experiments_preserves_order(self):
-        """Test that filtering preserves the order of experiments."""
-        experiments = ["z_exp", "a_exp", "m_exp", "test1", "b_exp"]
-        patterns = ["test*"]
+            def get(self, endpoint, params=None, require_auth=True):
+                self.endpoints.append(endpoint)
+                if endpoint.endswith("/info"):
+                    return {"success": True, "value": {"params": {"PNR": "X1234"}}}
+                return super().get(endpoint, params, require_auth)
 
-        result = _filter_experiments(experiments, patterns)
+        client = RecordingClient()
+        if workers is None:
+            fetch_experiment_data(client, "cxic00123")
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetch_experiment_data(client, "cxic00123", executor)
 
-        assert result == ["z_exp", "a_exp", "m_exp", "b_exp"]
+        assert sum(e.endswith("/info") for e in client.endpoints) == 1
+        assert any(e.endswith("/run23/X1234") for e in client.endpoints)
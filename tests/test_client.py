@@ -0,0 +1,154 @@
+"""Tests for the elog API client."""
+
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from elogfetch.api import client as client_module
+from elogfetch.api.client import AUTH_CACHE_TTL, ElogClient, _probe_credentials_cache
+
+
+class _GSSError(Exception):
+    pass
+
+
+def _fake_gssapi(lifetime=None, error=False):
+    """Build a stand-in gssapi module whose Credentials report lifetime."""
+
+    def credentials(usage):
+        if error:
+            raise _GSSError("no credentials cache found")
+        return SimpleNamespace(lifetime=lifetime)
+
+    return SimpleNamespace(
+        Credentials=credentials,
+        exceptions=SimpleNamespace(GSSError=_GSSError),
+    )
+
+
+class TestProbeCredentialsCache:
+    """Tests for checking Kerberos credentials without running klist."""
+
+    @pytest.mark.parametrize(
+        "gssapi, expected",
+        [
+            (_fake_gssapi(lifetime=3600), True),
+            (_fake_gssapi(lifetime=None), True),
+            (_fake_gssapi(lifetime=0), False),
+            (_fake_gssapi(error=True), False),
+        ],
+    )
+    def test_gssapi_result(self, monkeypatch, gssapi, expected):
+        """Test that gssapi's credential lifetime decides the result."""
+        monkeypatch.setitem(sys.modules, "gssapi", gssapi)
+
+        assert _probe_credentials_cache() is expected
+
+    @pytest.mark.parametrize("prefix", ["", "FILE:"])
+    def test_missing_file_cache(self, monkeypatch, tmp_path, prefix):
+        """Test that a file cache that doesn't exist means no ticket."""
+        monkeypatch.setitem(sys.modules, "gssapi", None)
+        monkeypatch.setenv("KRB5CCNAME", f"{prefix}{tmp_path / 'krb5cc_missing'}")
+
+        assert _probe_credentials_cache() is False
+
+    @pytest.mark.parametrize("ccname", [None, "KEYRING:persistent:1000", "{file}"])
+    def test_defers_to_klist(self, monkeypatch, tmp_path, ccname):
+        """Test that None is returned when only klist can tell."""
+        monkeypatch.setitem(sys.modules, "gssapi", None)
+        if ccname is None:
+            monkeypatch.delenv("KRB5CCNAME", raising=False)
+        else:
+            cache = tmp_path / "krb5cc_1000"
+            cache.touch()
+            monkeypatch.setenv("KRB5CCNAME", ccname.format(file=cache))
+
+        assert _probe_credentials_cache() is None
+
+
+class _FakeTicket:
+    """Stand-in for krtc.KerberosTicket that numbers the headers it issues."""
+
+    issued = 0
+
+    def __init__(self, principal):
+        self.principal = principal
+
+    def getAuthHeaders(self):
+        type(self).issued += 1
+        return {"Authorization": f"Negotiate {type(self).issued}"}
+
+
+class _FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = b'{"success": true}'
+        self.headers = {}
+
+    def json(self):
+        return {"success": True}
+
+
+class _FakeSession:
+    """Session that answers with queued status codes and records headers."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.sent_headers.append(headers)
+        return _FakeResponse(self.statuses.pop(0))
+
+    def close(self):
+        pass
+
+
+class TestAuthHeaderCache:
+    """Tests for the process-wide Kerberos auth header cache."""
+
+    @pytest.fixture(autouse=True)
+    def _stub_kerberos(self, monkeypatch):
+        self.now = 1000.0
+        _FakeTicket.issued = 0
+        monkeypatch.setattr(client_module, "_AUTH_CACHE", {})
+        monkeypatch.setattr(client_module, "KerberosTicket", _FakeTicket)
+        monkeypatch.setattr(client_module.time, "monotonic", lambda: self.now)
+        monkeypatch.setattr(ElogClient, "_check_kerberos_auth", lambda self: True)
+
+    def test_shared_between_clients(self):
+        """Test that clients for the same principal reuse one ticket."""
+        first = ElogClient()._get_auth_headers()
+        second = ElogClient()._get_auth_headers()
+        other = ElogClient(kerberos_principal="HTTP@other")._get_auth_headers()
+
+        assert first == second == {"Authorization": "Negotiate 1"}
+        assert other == {"Authorization": "Negotiate 2"}
+
+    def test_refreshed_after_ttl(self):
+        """Test that headers older than AUTH_CACHE_TTL are fetched again."""
+        client = ElogClient()
+        client._get_auth_headers()
+
+        self.now += AUTH_CACHE_TTL - 1
+        assert client._get_auth_headers() == {"Authorization": "Negotiate 1"}
+
+        self.now += 1
+        assert client._get_auth_headers() == {"Authorization": "Negotiate 2"}
+
+    def test_invalidated_on_401(self):
+        """Test that a 401 drops the cached headers and retries with new ones."""
+        client = ElogClient()
+        client._session = _FakeSession([401, 200])
+
+        assert client.get("/ws/info") == {"success": True}
+        assert client._session.sent_headers == [
+            {"Authorization": "Negotiate 1"},
+            {"Authorization": "Negotiate 2"},
+        ]
+        # Other clients pick up the refreshed headers
+        assert ElogClient()._get_auth_headers() == {"Authorization": "Negotiate 2"}
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 from unittest import mock
 
@@ -26,6 +27,14 @@ class TestDefaultConfig:
         assert config.lock_timeout == 60
         assert config.base_url == "https://pswww.slac.stanford.edu"
         assert config.exclude_patterns == []
+        assert config.in_memory is False
+
+    def test_config_is_frozen(self):
+        """Verify a loaded config can't be modified in place."""
+        config = Config()
+
+        with pytest.raises(FrozenInstanceError):
+            config.parallel_jobs = 1
 
 
 class TestConfigFromCLI:
@@ -40,6 +49,7 @@ class TestConfigFromCLI:
             "queue_size": 50,
             "batch_commit_size": 25,
             "database_dir": "/tmp/test_db",
+            "in_memory": True,
         }
 
         config = Config.load(cli_args=cli_args)
@@ -50,6 +60,7 @@ class TestConfigFromCLI:
         assert config.queue_size == 50
         assert config.batch_commit_size == 25
         assert config.database_dir == Path("/tmp/test_db")
+        assert config.in_memory is True
 
     def test_cli_args_partial_override(self):
         """Verify partial CLI args only override specified values."""
@@ -62,6 +73,19 @@ class TestConfigFromCLI:
         assert config.parallel_jobs == 10
         assert config.queue_size == 100
 
+    def test_with_overrides_keeps_loaded_values(self, tmp_path):
+        """Verify with_overrides layers CLI args on an already loaded config."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("hours_lookback: 48\nqueue_size: 200\n")
+        base = Config.load(config_file=config_file)
+
+        config = base.with_overrides({"hours": 24})
+
+        assert config.hours_lookback == 24.0
+        assert config.queue_size == 200
+        # Original config is left untouched
+        assert base.hours_lookback == 48.0
+
 
 class TestConfigFromEnv:
     """Tests for environment variable configuration."""
@@ -174,6 +198,21 @@ queue_size: 200
         # Default for batch_commit_size (50)
         assert config.batch_commit_size == 50
 
+    def test_toml_config_load(self, tmp_path):
+        """Verify TOML config files are read by suffix."""
+        config_file = tmp_path / "elogfetch.toml"
+        config_file.write_text(
+            "hours_lookback = 72\n"
+            'exclude_patterns = ["txi*"]\n'
+            "parallel_jobs = 4\n"
+        )
+
+        config = Config.load(config_file=config_file)
+
+        assert config.hours_lookback == 72.0
+        assert config.exclude_patterns == ["txi*"]
+        assert config.parallel_jobs == 4
+
     def test_missing_config_file(self, tmp_path):
         """Verify missing config file is handled gracefully."""
         config_file = tmp_path / "nonexistent.yaml"
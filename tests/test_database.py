@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import json
 import sqlite3
 from pathlib import Path
 
 import pytest
 
-from elogfetch.storage.database import Database
+from elogfetch.storage.database import (
+    CACHE_SIZE_KIB,
+    SCHEMA_VERSION,
+    Database,
+    find_latest_database,
+    prepare_experiment_rows,
+)
 
 
 class TestDatabaseCreation:
@@ -22,7 +29,7 @@ class TestDatabaseCreation:
         cursor = db.conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         )
-        tables = {row[0] for row in cursor.fetchall()}
+        tables = {row[0] for row in cursor}
 
         expected_tables = {
             "Detector",
@@ -41,7 +48,7 @@ class TestDatabaseCreation:
         cursor = db.conn.execute(
             "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'"
         )
-        indexes = {row[0] for row in cursor.fetchall()}
+        indexes = {row[0] for row in cursor}
 
         expected_indexes = {
             "idx_questionnaire_experiment",
@@ -55,6 +62,27 @@ class TestDatabaseCreation:
 
         db.close()
 
+    def test_schema_version_recorded(self, tmp_path):
+        """Verify the schema version is stored and gates table creation."""
+        db_path = tmp_path / "test.db"
+        db = Database(db_path)
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        db.close()
+
+        # A database from before versioning (user_version 0) is upgraded
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("DROP INDEX idx_production_run")
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        conn.close()
+
+        db = Database(db_path)
+        cursor = db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'idx_production_run'"
+        )
+        assert cursor.fetchone() is not None
+        db.close()
+
     def test_database_file_created(self, tmp_path):
         """Verify database file is created on disk."""
         db_path = tmp_path / "test.db"
@@ -65,6 +93,49 @@ class TestDatabaseCreation:
 
         db.close()
 
+    def test_readonly_reads_existing_data(self, tmp_path, sample_experiment_data):
+        """Verify a read-only connection sees data and rejects writes."""
+        db_path = tmp_path / "test.db"
+        db = Database(db_path)
+        db.insert_experiment(sample_experiment_data)
+        db.close()
+
+        ro = Database(db_path, readonly=True)
+        assert ro.get_stats()["experiment"] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            ro.set_metadata("key", "value")
+        ro.close()
+
+    def test_readonly_missing_file(self, tmp_path):
+        """Verify a read-only open doesn't create a missing database."""
+        db_path = tmp_path / "missing.db"
+
+        with pytest.raises(sqlite3.OperationalError):
+            Database(db_path, readonly=True)
+        assert not db_path.exists()
+
+
+class TestFindLatestDatabase:
+    """Tests for locating the newest database in a directory."""
+
+    def test_picks_latest_by_name(self, tmp_path):
+        """Test that the newest timestamped name wins, ignoring other files."""
+        for name in [
+            "elog_2024_0101_0900.db",
+            "elog_2024_1231_2359.db",
+            "elog_2024_0601_1200.db",
+            "elog_backup.db",
+            "notes.txt",
+        ]:
+            (tmp_path / name).touch()
+
+        assert find_latest_database(tmp_path) == tmp_path / "elog_2024_1231_2359.db"
+
+    def test_no_database(self, tmp_path):
+        """Test that None is returned for empty or missing directories."""
+        assert find_latest_database(tmp_path) is None
+        assert find_latest_database(tmp_path / "missing") is None
+
 
 class TestWALMode:
     """Tests for Write-Ahead Logging mode."""
@@ -81,6 +152,47 @@ class TestWALMode:
 
         db.close()
 
+    def test_wal_mode_is_default(self, tmp_path):
+        """Verify writable connections start in WAL mode with NORMAL sync."""
+        db = Database(tmp_path / "test.db")
+
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+        db.close()
+
+    def test_tune_for_bulk_writes(self, tmp_path):
+        """Verify bulk-write PRAGMAs are applied."""
+        db_path = tmp_path / "test.db"
+        db = Database(db_path)
+        db.enable_wal_mode()
+        db.tune_for_bulk_writes()
+
+        assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert db.conn.execute("PRAGMA cache_size").fetchone()[0] == -CACHE_SIZE_KIB
+        assert db.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+
+        db.close()
+
+    def test_reader_not_blocked_by_writer(self, tmp_path, sample_experiment_data):
+        """Verify a reader sees committed data while a write is in progress."""
+        db = Database(tmp_path / "test.db")
+        db.insert_experiment(sample_experiment_data)
+        reader = db.reader()
+
+        with db.transaction():
+            db.conn.execute("DELETE FROM Experiment")
+            # Uncommitted delete is invisible and doesn't lock the reader out
+            assert reader.get_stats()["experiment"] == 1
+
+        assert reader.get_stats()["experiment"] == 0
+        with pytest.raises(sqlite3.OperationalError):
+            reader.set_metadata("key", "value")
+
+        reader.close()
+        db.close()
+
     def test_close_removes_wal_files(self, tmp_path, sample_experiment_data):
         """Verify WAL and SHM files are removed when database is closed.
 
@@ -126,10 +238,9 @@ class TestWALMode:
 class TestExperimentOperations:
     """Tests for experiment CRUD operations."""
 
-    def test_insert_and_query_experiment(self, tmp_path, sample_experiment_data):
+    def test_insert_and_query_experiment(self, mem_db, sample_experiment_data):
         """Test inserting and querying experiment data."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         db.insert_experiment(sample_experiment_data)
 
@@ -145,19 +256,54 @@ class TestExperimentOperations:
         assert row["instrument"] == sample_experiment_data["instrument"]
         assert row["pi"] == sample_experiment_data["pi"]
 
-        db.close()
+    def test_unchanged_questionnaire_is_not_rewritten(
+        self, mem_db, sample_questionnaire_data
+    ):
+        """Test that re-inserting identical data skips the delete/insert."""
+        db = mem_db
+        db.insert_questionnaire(sample_questionnaire_data)
+        rowids = db.conn.execute("SELECT rowid FROM Questionnaire").fetchall()
+
+        db.insert_questionnaire(sample_questionnaire_data)
+        assert db.conn.execute("SELECT rowid FROM Questionnaire").fetchall() == rowids
+
+        changed = dict(sample_questionnaire_data, fields=[])
+        db.insert_questionnaire(changed)
+        assert db.conn.execute("SELECT COUNT(*) FROM Questionnaire").fetchone()[0] == 0
+
+        # Deleting the experiment forgets the digest so data is rewritten
+        db.delete_experiment("cxic00123")
+        db.insert_questionnaire(changed)
+        db.insert_questionnaire(sample_questionnaire_data)
+        assert db.conn.execute("SELECT COUNT(*) FROM Questionnaire").fetchone()[0] == 2
+
+    def test_unchanged_logbook_is_not_rewritten(
+        self, mem_db, sample_experiment_data, sample_logbook_entries
+    ):
+        """Test that a repeated fetch keeps logbook rows, but batches don't hash."""
+        db = mem_db
+        db.insert_experiment_batch(
+            {"info": sample_experiment_data, "logbook": sample_logbook_entries}
+        )
+        cursor = db.conn.execute("SELECT COUNT(*) FROM Metadata")
+        assert cursor.fetchone()[0] == 0
+
+        db.insert_logbook(sample_logbook_entries)
+        rowids = db.conn.execute("SELECT rowid FROM Logbook").fetchall()
+
+        db.insert_logbook(sample_logbook_entries)
+        assert db.conn.execute("SELECT rowid FROM Logbook").fetchall() == rowids
 
     def test_insert_experiment_batch(
         self,
-        tmp_path,
+        mem_db,
         sample_experiment_data,
         sample_logbook_entries,
         sample_questionnaire_data,
         sample_workflow_data,
     ):
         """Test batch insert of experiment with related data."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         batch_data = {
             "info": sample_experiment_data,
@@ -184,19 +330,34 @@ class TestExperimentOperations:
         # Verify workflows
         cursor = db.conn.execute("SELECT COUNT(*) FROM Workflow")
         assert cursor.fetchone()[0] == 1
+        cursor = db.conn.execute("SELECT parameters FROM Workflow")
+        assert json.loads(cursor.fetchone()[0]) == {"resolution": 2.5}
+
+    def test_workflow_parameters_stored_as_json_dumps(self, mem_db):
+        """Test that parameters text is exactly json.dumps output."""
+        db = mem_db
+        parameters = {"sample": "Lysozym\u00e9", "threshold": float("nan")}
+        db.insert_workflow(
+            {
+                "experiment_id": "cxic00123",
+                "workflows": [{"name": "auto_sfx", "parameters": parameters}],
+            }
+        )
 
-        db.close()
+        cursor = db.conn.execute("SELECT parameters FROM Workflow")
+        stored = cursor.fetchone()[0]
+        assert stored == json.dumps(parameters)
+        assert "NaN" in stored
 
     def test_delete_experiment_cascade(
         self,
-        tmp_path,
+        mem_db,
         sample_experiment_data,
         sample_logbook_entries,
         sample_runtable_data,
     ):
         """Test cascade deletion of experiment and related data."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         # Insert experiment with related data
         db.insert_experiment(sample_experiment_data)
@@ -240,16 +401,13 @@ class TestExperimentOperations:
         )
         assert cursor.fetchone()[0] == 0
 
-        db.close()
-
 
 class TestMetadataOperations:
     """Tests for metadata storage."""
 
-    def test_metadata_operations(self, tmp_path):
+    def test_metadata_operations(self, mem_db):
         """Test set_metadata and get_metadata work correctly."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         # Test setting and getting metadata
         db.set_metadata("last_update", "2024-01-15T10:00:00")
@@ -263,22 +421,19 @@ class TestMetadataOperations:
         db.set_metadata("last_update", "2024-01-16T12:00:00")
         assert db.get_metadata("last_update") == "2024-01-16T12:00:00"
 
-        db.close()
-
 
 class TestStatistics:
     """Tests for database statistics."""
 
     def test_get_stats(
         self,
-        tmp_path,
+        mem_db,
         sample_experiment_data,
         sample_logbook_entries,
         sample_runtable_data,
     ):
         """Test statistics query returns correct counts."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         # Insert some data
         db.insert_experiment(sample_experiment_data)
@@ -291,12 +446,9 @@ class TestStatistics:
         assert stats["logbook"] == 3
         assert stats["run"] >= 2  # From logbook and runtable
 
-        db.close()
-
-    def test_get_stats_empty_database(self, tmp_path):
+    def test_get_stats_empty_database(self, mem_db):
         """Test statistics on empty database."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         stats = db.get_stats()
 
@@ -306,16 +458,15 @@ class TestStatistics:
         assert stats["questionnaire"] == 0
         assert stats["workflow"] == 0
 
-        db.close()
-
 
 class TestRunAndDetectorOperations:
     """Tests for run and detector data."""
 
-    def test_runtable_insert(self, tmp_path, sample_experiment_data, sample_runtable_data):
+    def test_runtable_insert(
+        self, mem_db, sample_experiment_data, sample_runtable_data
+    ):
         """Test inserting run table data."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         db.insert_experiment(sample_experiment_data)
         db.insert_runtable(sample_runtable_data)
@@ -332,14 +483,11 @@ class TestRunAndDetectorOperations:
         cursor = db.conn.execute("SELECT COUNT(*) FROM Detector")
         assert cursor.fetchone()[0] == 2  # cspad and epix
 
-        db.close()
-
     def test_file_manager_insert(
-        self, tmp_path, sample_experiment_data, sample_file_manager_data
+        self, mem_db, sample_experiment_data, sample_file_manager_data
     ):
         """Test inserting file manager data."""
-        db_path = tmp_path / "test.db"
-        db = Database(db_path)
+        db = mem_db
 
         db.insert_experiment(sample_experiment_data)
         db.insert_file_manager(sample_file_manager_data)
@@ -356,4 +504,315 @@ class TestRunAndDetectorOperations:
         assert row["number_of_files"] == 10
         assert row["total_size_bytes"] == 1073741824
 
+    def test_run_id_cache_is_bounded(self, mem_db, monkeypatch):
+        """Test that the run ID cache evicts least recently used entries."""
+        monkeypatch.setattr("elogfetch.storage.database.RUN_ID_CACHE_SIZE", 3)
+        db = mem_db
+
+        db._get_or_create_run_ids("exp1", [1, 2, 3])
+        db._get_or_create_run_id("exp1", 1)
+        db._get_or_create_run_ids("exp2", [1])
+
+        assert list(db._run_id_cache) == [("exp1", 3), ("exp1", 1), ("exp2", 1)]
+
+    def test_runtable_and_file_manager_share_row(
+        self, mem_db, sample_runtable_data, sample_file_manager_data
+    ):
+        """Test that both sources upsert into one production row per run."""
+        db = mem_db
+
+        db.insert_runtable(sample_runtable_data)
+        db.insert_file_manager(sample_file_manager_data)
+        db.insert_runtable(sample_runtable_data)
+
+        cursor = db.conn.execute(
+            """
+            SELECT COUNT(*), MAX(n_events), MAX(number_of_files)
+            FROM RunProductionData rpd
+            JOIN Run r ON rpd.run_id = r.run_id
+            WHERE r.run_number = 1
+            """
+        )
+        count, n_events, number_of_files = cursor.fetchone()
+        assert count == 1
+        assert n_events is not None
+        assert number_of_files == 10
+
+    def test_get_or_create_run_ids_bulk(self, mem_db):
+        """Test that bulk run resolution reuses existing runs."""
+        db = mem_db
+
+        first = db._get_or_create_run_ids("exp1", [3, 1, 2, 1])
+        db._run_id_cache.clear()
+        second = db._get_or_create_run_ids("exp1", [1, 2, 3, 4])
+
+        assert set(first) == {1, 2, 3}
+        assert {n: second[n] for n in first} == first
+        cursor = db.conn.execute("SELECT COUNT(*) FROM Run")
+        assert cursor.fetchone()[0] == 4
+
+
+class TestBulkLoadIndexes:
+    """Tests for dropping and recreating indexes around bulk loads."""
+
+    @staticmethod
+    def _index_names(db):
+        cursor = db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        )
+        return {row[0] for row in cursor}
+
+    def test_drop_and_recreate_indexes(self, fresh_db):
+        """Test that write-path indexes stay and dropped ones come back."""
+        db = fresh_db
+        before = self._index_names(db)
+
+        statements = db.drop_secondary_indexes()
+
+        remaining = self._index_names(db)
+        assert "idx_logbook_experiment" in remaining
+        assert "idx_questionnaire_category" not in remaining
+        assert len(statements) == len(before) - len(remaining)
+
+        db.recreate_indexes(statements)
+        assert self._index_names(db) == before
+
+    def test_dropped_indexes_restored_on_reopen(self, tmp_path):
+        """Test that indexes dropped by an interrupted load come back on open."""
+        db = Database(tmp_path / "test.db")
+        before = self._index_names(db)
+
+        # Simulate a crash between drop_secondary_indexes and recreate_indexes
+        db.drop_secondary_indexes()
+        db.close()
+
+        reopened = Database(tmp_path / "test.db")
+        assert self._index_names(reopened) == before
+        version = reopened.conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == SCHEMA_VERSION
+        reopened.close()
+
+    def test_bulk_load_restores_indexes_on_error(
+        self, fresh_db, sample_experiment_data
+    ):
+        """Test that bulk_load() rebuilds indexes even if the load fails."""
+        db = fresh_db
+        before = self._index_names(db)
+
+        with pytest.raises(RuntimeError):
+            with db.bulk_load():
+                assert "idx_logbook_run" not in self._index_names(db)
+                db.begin()
+                db._insert_experiment_no_commit(sample_experiment_data)
+                raise RuntimeError("boom")
+
+        assert self._index_names(db) == before
+        assert db.conn.execute("SELECT COUNT(*) FROM Experiment").fetchone()[0] == 0
+
+
+class TestInMemoryStaging:
+    """Tests for staging a database in memory and backing it up to disk."""
+
+    def test_backup_to_writes_file(self, tmp_path, sample_experiment_data):
+        """Test that an in-memory database is copied to disk intact."""
+        db = Database(Path(":memory:"))
+        db.insert_experiment(sample_experiment_data)
+
+        db_path = tmp_path / "staged.db"
+        db.backup_to(db_path)
+        db.close()
+
+        disk = Database(db_path, readonly=True)
+        assert disk.get_stats()["experiment"] == 1
+        assert disk.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        disk.close()
+
+    def test_load_from_copies_existing(self, tmp_path, sample_experiment_data):
+        """Test that load_from() seeds a staging database from a file."""
+        base_path = tmp_path / "base.db"
+        base = Database(base_path)
+        base.insert_experiment(sample_experiment_data)
+        base.close()
+
+        db = Database(Path(":memory:"))
+        db.load_from(base_path)
+
+        assert db.get_stats()["experiment"] == 1
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
         db.close()
+
+
+class TestTransactions:
+    """Tests for explicit batch transactions."""
+
+    def test_begin_commit_persists_batch(
+        self, tmp_path, fresh_db, sample_experiment_data, sample_logbook_entries
+    ):
+        """Test that a batch inside begin()/commit() is persisted."""
+        db_path = tmp_path / "test.db"
+        db = fresh_db
+
+        db.begin()
+        assert db.conn.in_transaction
+        db.insert_experiment_batch(
+            {"info": sample_experiment_data, "logbook": sample_logbook_entries}
+        )
+        db.commit()
+
+        # Read back through a separate connection; the fixture closes db
+        reader = Database(db_path, readonly=True)
+        assert reader.conn.execute("SELECT COUNT(*) FROM Logbook").fetchone()[0] == 3
+        reader.close()
+
+    def test_transaction_rolls_back_on_error(self, fresh_db, sample_experiment_data):
+        """Test that transaction() commits on success and rolls back on error."""
+        db = fresh_db
+
+        with db.transaction():
+            db._insert_experiment_no_commit(sample_experiment_data)
+        assert not db.conn.in_transaction
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db._delete_experiment_no_commit(sample_experiment_data["experiment_id"])
+                raise RuntimeError("boom")
+
+        cursor = db.conn.execute("SELECT COUNT(*) FROM Experiment")
+        assert cursor.fetchone()[0] == 1
+
+    def test_rollback_discards_batch(self, fresh_db, sample_experiment_data):
+        """Test that rollback() discards uncommitted inserts."""
+        db = fresh_db
+
+        db.begin()
+        db.insert_experiment_batch({"info": sample_experiment_data})
+        db.rollback()
+
+        cursor = db.conn.execute("SELECT COUNT(*) FROM Experiment")
+        assert cursor.fetchone()[0] == 0
+
+    def test_rollback_clears_id_caches(
+        self, fresh_db, sample_experiment_data, sample_runtable_data
+    ):
+        """Test that run/detector IDs created in a rolled-back batch are forgotten."""
+        db = fresh_db
+
+        db.begin()
+        db.insert_experiment_batch(
+            {"info": sample_experiment_data, "runtable": sample_runtable_data}
+        )
+        db.rollback()
+        db.insert_runtable(sample_runtable_data)
+
+        cursor = db.conn.execute(
+            "SELECT COUNT(*) FROM RunDetector rd JOIN Run r ON rd.run_id = r.run_id"
+        )
+        assert cursor.fetchone()[0] == 4
+
+    def test_batch_replace_deletes_existing(
+        self, fresh_db, sample_experiment_data, sample_logbook_entries
+    ):
+        """Test that replace=True clears old rows for the experiment."""
+        db = fresh_db
+        batch = {
+            "experiment_id": sample_experiment_data["experiment_id"],
+            "info": sample_experiment_data,
+            "logbook": sample_logbook_entries,
+        }
+
+        db.insert_experiment_batch(batch)
+        db.insert_experiment_batch(batch, replace=True)
+        db.commit()
+
+        cursor = db.conn.execute("SELECT COUNT(*) FROM Logbook")
+        assert cursor.fetchone()[0] == 3
+
+
+class TestInsertExperimentsMany:
+    """Tests for multi-experiment batch inserts."""
+
+    @staticmethod
+    def _batch(experiment_id, sample):
+        info = dict(sample["info"], experiment_id=experiment_id)
+        logbook = [dict(e, experiment_id=experiment_id) for e in sample["logbook"]]
+        return {
+            "experiment_id": experiment_id,
+            "info": info,
+            "logbook": logbook,
+            "runtable": dict(sample["runtable"], experiment_id=experiment_id),
+            "questionnaire": dict(sample["questionnaire"], experiment_id=experiment_id),
+            "workflow": dict(sample["workflow"], experiment_id=experiment_id),
+        }
+
+    @pytest.fixture
+    def sample(
+        self,
+        sample_experiment_data,
+        sample_logbook_entries,
+        sample_runtable_data,
+        sample_questionnaire_data,
+        sample_workflow_data,
+    ):
+        return {
+            "info": sample_experiment_data,
+            "logbook": sample_logbook_entries,
+            "runtable": sample_runtable_data,
+            "questionnaire": sample_questionnaire_data,
+            "workflow": sample_workflow_data,
+        }
+
+    def test_insert_experiments_many(self, fresh_db, sample):
+        """Test that every experiment in the batch is written."""
+        db = fresh_db
+        batch = [self._batch(f"exp{i}", sample) for i in range(3)]
+
+        db.insert_experiments_many(batch)
+        db.commit()
+
+        stats = db.get_stats()
+        assert stats["experiment"] == 3
+        assert stats["logbook"] == 9
+        assert stats["questionnaire"] == 6
+        assert stats["workflow"] == 3
+        assert stats["run"] == 6
+
+    def test_insert_experiments_many_replace(self, fresh_db, sample):
+        """Test that replace=True doesn't duplicate rows on re-insert."""
+        db = fresh_db
+        batch = [self._batch(f"exp{i}", sample) for i in range(2)]
+
+        db.insert_experiments_many(batch)
+        db.insert_experiments_many(batch, replace=True)
+        db.commit()
+
+        stats = db.get_stats()
+        assert stats["experiment"] == 2
+        assert stats["logbook"] == 6
+        assert stats["workflow"] == 2
+
+    def test_insert_prepared_many(self, fresh_db, sample):
+        """Test that prepared row tuples insert the same data."""
+        db = fresh_db
+        rows = prepare_experiment_rows(self._batch("exp0", sample))
+        assert all(isinstance(row, tuple) for row in rows["logbook"])
+
+        db.insert_prepared_many([rows])
+        db.commit()
+
+        stats = db.get_stats()
+        assert stats["experiment"] == 1
+        assert stats["logbook"] == 3
+        assert stats["questionnaire"] == 2
+
+    def test_delete_experiments_only_removes_listed(self, fresh_db, sample):
+        """Test that batched deletes leave other experiments untouched."""
+        db = fresh_db
+        db.insert_experiments_many([self._batch(f"exp{i}", sample) for i in range(3)])
+
+        db._delete_experiments_no_commit(["exp0", "exp2"])
+        db.commit()
+
+        cursor = db.conn.execute("SELECT DISTINCT experiment_id FROM Run")
+        assert [row[0] for row in cursor] == ["exp1"]
+        cursor = db.conn.execute("SELECT COUNT(*) FROM RunDetector")
+        assert cursor.fetchone()[0] == 4
@@ -0,0 +1,35 @@
+"""Tests for logging setup."""
+
+from __future__ import annotations
+
+import logging
+
+from elogfetch.utils import setup_logging, teardown_logging
+
+
+class TestSetupLogging:
+    """Tests for the queue-backed logging setup."""
+
+    def test_records_reach_file_after_teardown(self, tmp_path):
+        """Test that queued records are flushed to the handlers on teardown."""
+        log_file = tmp_path / "elogfetch.log"
+        logger = setup_logging(level=logging.INFO, log_file=log_file, quiet=True)
+
+        logger.info("fetched %d runs", 3)
+        logger.debug("not emitted")
+        teardown_logging()
+
+        text = log_file.read_text()
+        assert "INFO - fetched 3 runs" in text
+        assert "not emitted" not in text
+
+    def test_teardown_detaches_queue_handler(self, tmp_path):
+        """Test that records logged after teardown don't collect in the queue."""
+        log_file = tmp_path / "elogfetch.log"
+        logger = setup_logging(level=logging.INFO, log_file=log_file, quiet=True)
+
+        teardown_logging()
+        logger.info("after teardown")
+
+        assert logger.handlers == []
+        assert "after teardown" not in log_file.read_text()
@@ -0,0 +1,48 @@
+"""Tests for queue utilities."""
+
+from __future__ import annotations
+
+import threading
+
+from elogfetch.utils.queues import ByteBoundedQueue
+
+
+class TestByteBoundedQueue:
+    """Tests for the ByteBoundedQueue class."""
+
+    def test_fifo_order(self):
+        """Test that items come out in the order they were put."""
+        q = ByteBoundedQueue(maxsize=10, max_bytes=1000)
+        for i in range(5):
+            q.put(i, size=10)
+
+        assert [q.get() for _ in range(5)] == [0, 1, 2, 3, 4]
+        assert q.nbytes == 0
+
+    def test_put_blocks_when_over_byte_budget(self):
+        """Test that a producer waits until enough bytes are consumed."""
+        q = ByteBoundedQueue(max_bytes=100)
+        q.put("big", size=80)
+
+        done = threading.Event()
+
+        def producer():
+            q.put("second", size=50)
+            done.set()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+
+        assert not done.wait(0.1)
+        assert q.get() == "big"
+        assert done.wait(1)
+        thread.join()
+        assert q.get() == "second"
+
+    def test_oversized_item_admitted_when_empty(self):
+        """Test that an item larger than the budget doesn't deadlock."""
+        q = ByteBoundedQueue(max_bytes=10)
+        q.put("huge", size=1000)
+
+        assert q.qsize() == 1
+        assert q.get() == "huge"